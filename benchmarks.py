@@ -0,0 +1,392 @@
+# benchmarks.py
+# Frame-cost benchmarks that run on a headless Linux box. Simulation benchmarks use the
+# headless models; draw benchmarks use arcade's headless (EGL) mode and are skipped when
+# no GL context can be created.
+#
+#   python benchmarks.py                                  # run, write benchmark_results.json
+#   python benchmarks.py --baseline baseline.json         # also compare, exit 1 on regression
+#   python benchmarks.py --output baseline.json           # refresh the stored baseline
+import os
+os.environ.setdefault("ARCADE_HEADLESS", "1")  # Must be set before arcade is imported
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import keys
+from utils import build_terminal, system_checks
+from game_state import GameState
+from ship_data import load_ship
+from location_model import LocationModel
+from terminal.terminal_model import TerminalModel
+from terminal.scrollback import Scrollback
+from ship_systems import ShipSystems
+from ship_index import open_ship
+from navigation import NavigationGraph
+from vfs import LogFile
+from search_index import SearchIndex
+from headless import HeadlessSession
+from savegame import capture, encode
+from constants import SYSTEM_TICK
+
+SEED = 1234
+FRAME = 1 / 60
+SHIP = load_ship()
+CORRIDOR = SHIP.room("corridor")
+
+# Integrity levels giving roughly no / moderate / heavy degradation
+DEGRADATION_LEVELS = {
+    "healthy": {"cpu": 100, "memory": 100, "storage": 100},
+    "worn": {"cpu": 60, "memory": 60, "storage": 60},
+    "failing": {"cpu": 20, "memory": 25, "storage": 30},
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def make_terminal(integrity, seed=SEED):
+    rng = GameState(seed).spawn_rng()
+    terminal = TerminalModel(build_terminal(integrity, "MOTHER", rng), rng=rng)
+    terminal.game_view = GameState(seed)
+    return terminal
+
+
+def booted_terminal(integrity=DEGRADATION_LEVELS["healthy"]):
+    terminal = make_terminal(integrity)
+    terminal.update(0)
+    terminal.skip_typing()
+    terminal.update(0)
+    return terminal
+
+
+def run_frames(terminal, done):
+    frames = 0
+    while not done() and frames < 1_000_000:
+        terminal.update(FRAME)
+        frames += 1
+    return frames
+
+
+# --- Simulation ---------------------------------------------------------------
+
+def make_boot_benchmark(level, integrity):
+    def bench():
+        terminal = make_terminal(integrity)
+        start = time.perf_counter()
+        frames = run_frames(terminal, lambda: terminal.input_mode)
+        return time.perf_counter() - start, {"frames": frames, "degradation": system_checks(integrity)}
+    return bench
+
+
+for _level, _integrity in DEGRADATION_LEVELS.items():
+    benchmark(f"boot_typing_{_level}")(make_boot_benchmark(_level, _integrity))
+
+
+@benchmark("response_typing_2k_lines")
+def bench_response_dump():
+    terminal = booted_terminal()
+    lines = [{"text": f"{i:05d} DIAG sector {i % 97:02d} nominal  0x{i * 2654435761 % 2**32:08x}"} for i in range(2000)]
+    start = time.perf_counter()
+    terminal.start_typing_response(lines)
+    frames = run_frames(terminal, lambda: not terminal.typing_response)
+    return time.perf_counter() - start, {"frames": frames}
+
+
+@benchmark("scrollback_20k_lines")
+def bench_scrollback():
+    scrollback = Scrollback(max_lines=10_000)
+    line = "TTY=pts/0; PWD=/var/log; USER = root; COMMAND=usr/bin/tail -f"
+    start = time.perf_counter()
+    for _ in range(20_000):
+        scrollback.append("")
+        for char in line:
+            scrollback.append_char(char)
+    return time.perf_counter() - start, {"kept_lines": len(scrollback), "bytes": scrollback.byte_size}
+
+
+@benchmark("scrollback_paging")
+def bench_paging():
+    terminal = booted_terminal()
+    for i in range(12_000):
+        terminal.displayed_text.append(f"log line {i}")
+    start = time.perf_counter()
+    for _ in range(500):
+        terminal.key_press(keys.PAGEUP, 0)
+    for _ in range(500):
+        terminal.key_press(keys.PAGEDOWN, 0)
+    return time.perf_counter() - start, {"kept_lines": len(terminal.displayed_text)}
+
+
+@benchmark("room_commands_10k")
+def bench_room_commands():
+    game_state = GameState(SEED)
+    room = LocationModel(CORRIDOR, {}, game_state)
+    commands = ["look", "help", "xyzzy", "l"]
+    start = time.perf_counter()
+    for i in range(10_000):
+        for char in commands[i % len(commands)]:
+            room.key_press(ord(char), 0)
+        room.key_press(keys.ENTER, 0)
+    return time.perf_counter() - start, {"messages": len(room.messages)}
+
+
+@benchmark("timestamp_100k")
+def bench_timestamp():
+    game_state = GameState(SEED)
+    start = time.perf_counter()
+    for _ in range(100_000):
+        game_state.update_time(FRAME)
+        game_state.get_timestamp()
+    return time.perf_counter() - start, {}
+
+
+@benchmark("ship_systems_5k_terminals")
+def bench_ship_systems():
+    specs = [{"name": f"t{i}", "integrity": DEGRADATION_LEVELS["worn"]} for i in range(5000)]
+    systems = ShipSystems(specs, SEED)
+    start = time.perf_counter()
+    for _ in range(3600):  # One hour of game time
+        systems.tick(SYSTEM_TICK)
+    return time.perf_counter() - start, {"components": systems.integrity.size}
+
+
+@benchmark("routes_5k_rooms")
+def bench_routes():
+    # A 70-wide grid of rooms; 1000 queries from 50 origins, the first one building the graph
+    width, count = 70, 5000
+    locations = []
+    for i in range(count):
+        neighbours = [j for j in (i - width, i - 1, i + 1, i + width) if 0 <= j < count]
+        locations.append({"id": f"r{i}", "name": f"Room {i}", "description": [],
+                          "exits": {f"door {j}": f"r{j}" for j in neighbours}})
+    rng = random.Random(SEED)
+    queries = [(f"r{rng.randrange(50)}", f"r{rng.randrange(count)}") for _ in range(1000)]
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "grid.json")
+        with open(source, "w") as f:
+            json.dump({"start": "r0", "terminals": [], "locations": locations}, f)
+        ship = open_ship(source)
+        navigation = NavigationGraph(ship)
+        start = time.perf_counter()
+        steps = sum(navigation.route(origin, target).steps for origin, target in queries)
+        elapsed = time.perf_counter() - start
+        ship.close()
+    return elapsed, {"mean_steps": steps / len(queries)}
+
+
+@benchmark("log_open_8mb")
+def bench_log_open():
+    # Open a large log, read its first screen and its tail, as less and tail do
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ship.log")
+        with open(path, "w") as f:
+            for i in range(150_000):
+                f.write(f"12 DEC 2175 {i % 24:02d}:{i % 60:02d}:00 kernel: storage parity error on sector {i}\n")
+        start = time.perf_counter()
+        log = LogFile(path)
+        first = log.lines(0, 40)
+        last, _ = log.tail(10)
+        elapsed = time.perf_counter() - start
+        info = {"bytes": log.size, "indexed_bytes": log.indexed}
+        log.close()
+    return elapsed, info
+
+
+@benchmark("search_history_100k")
+def bench_search_history():
+    # Queries against a full terminal history; the index is built outside the timing
+    rng = random.Random(SEED)
+    words = ["kernel", "storage", "parity", "error", "sector", "reactor", "core", "coolant", "hull", "pod"]
+    history = SearchIndex(100_000)
+    for i in range(100_000):
+        history.add(f"{i:06d} " + " ".join(rng.choice(words) for _ in range(6)) + f" id{rng.randrange(50_000)}")
+    queries = ["id4242", "hull breach", "parity error", "stor", " core ", "no such text"]
+    history.search("warm up")  # First search packs the vocabulary
+    start = time.perf_counter()
+    hits = sum(len(history.search(query, 101)) for query in queries)
+    return time.perf_counter() - start, {"hits": hits}
+
+
+@benchmark("autosave_capture")
+def bench_autosave_capture():
+    # The frame-side cost of an autosave: snapshot a session whose terminal has a long history
+    session = HeadlessSession(SEED)
+    for command in ("north", "use terminal"):
+        session.type_command(command)
+    session.run_until_idle()
+    terminal = session.terminals["mother"]
+    for i in range(20_000):
+        terminal.displayed_text.append(f"{i:06d} kernel: storage parity error on sector {i}")
+    start = time.perf_counter()
+    snapshot = capture(session)
+    elapsed = time.perf_counter() - start
+    return elapsed, {"encoded_bytes": len(encode(snapshot))}
+
+
+# --- Drawing (needs a GL context) ---------------------------------------------
+
+_window = None
+
+
+def get_window():
+    """Shared headless window, or None when GL is unavailable"""
+    global _window
+    if _window is None:
+        try:
+            import arcade
+            from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+            _window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, visible=False)
+            _window.ship = SHIP  # Rooms look up their neighbours here (MyGame.ship)
+        except Exception as e:
+            print(f"Draw benchmarks skipped: {e}", file=sys.stderr)
+            _window = False
+    return _window or None
+
+
+def time_draws(view, frames=60, redraw=True):
+    """Per-frame draw time; redraw=False measures the idle path that reuses the last frame"""
+    view.on_draw()  # Warm caches / first layout
+    view.window.ctx.finish()
+    start = time.perf_counter()
+    for _ in range(frames):
+        if redraw:
+            view.frame_cache.invalidate()
+        view.on_draw()
+    view.window.ctx.finish()
+    return (time.perf_counter() - start) / frames
+
+
+def full_terminal_view(window):
+    from terminal.terminal_view import Terminal
+    view = Terminal(build_terminal(DEGRADATION_LEVELS["healthy"], "MOTHER", GameState(SEED).rng))
+    window.show_view(view)
+    model = view.model
+    model.update(0)
+    model.skip_typing()
+    for i in range(200):
+        model.displayed_text.append(f"{i:04d} ship log entry: pressure nominal, hull temp 4.2K")
+    return view
+
+
+@benchmark("draw_terminal_full_screen")
+def bench_draw_terminal():
+    window = get_window()
+    if not window:
+        return None
+    per_frame = time_draws(full_terminal_view(window))
+    return per_frame, {"per": "frame"}
+
+
+@benchmark("draw_terminal_idle")
+def bench_draw_terminal_idle():
+    window = get_window()
+    if not window:
+        return None
+    per_frame = time_draws(full_terminal_view(window), redraw=False)
+    return per_frame, {"per": "frame"}
+
+
+@benchmark("draw_location")
+def bench_draw_location():
+    window = get_window()
+    if not window:
+        return None
+    from locations import Location
+    game_state = GameState(SEED)
+    view = Location({}, game_state)
+    view.bind(LocationModel(CORRIDOR, {}, game_state))
+    window.show_view(view)
+    view.model.messages.extend(CORRIDOR.description * 3)
+    per_frame = time_draws(view)
+    return per_frame, {"per": "frame"}
+
+
+# --- Runner -------------------------------------------------------------------
+
+def run(names, repeat):
+    results = {}
+    for name in names:
+        samples = []
+        info = {}
+        for _ in range(repeat):
+            outcome = BENCHMARKS[name]()
+            if outcome is None:
+                break
+            elapsed, info = outcome
+            samples.append(elapsed)
+        if not samples:
+            continue
+        results[name] = {
+            "median_s": statistics.median(samples),
+            "min_s": min(samples),
+            "runs": len(samples),
+            **info,
+        }
+        print(f"{name:32s} median {results[name]['median_s'] * 1000:10.3f} ms   min {results[name]['min_s'] * 1000:10.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return names whose median got slower than baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Stored results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    results = run(args.names or list(BENCHMARKS), args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
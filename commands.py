@@ -0,0 +1,129 @@
+# commands.py
+from os.path import commonprefix
+
+AMBIGUOUS = object()  # Trie mark: more than one command below this prefix
+
+
+class Command:
+    __slots__ = ("name", "handler", "help", "aliases", "args", "background", "exact")
+
+    def __init__(self, name, handler, help="", aliases=(), args=False, background=False, exact=False):
+        self.name = name
+        self.handler = handler
+        self.help = help
+        self.aliases = tuple(aliases)
+        self.args = args  # Handler takes the rest of the line as a second argument
+        self.background = background  # Handler returns an iterator to run as a Job (jobs.py)
+        self.exact = exact  # Only the whole word runs it, never a prefix (exit, quit...)
+
+
+class _Node:
+    __slots__ = ("children", "command", "word")
+
+    def __init__(self):
+        self.children = {}
+        self.command = None  # The one command every word below starts, or AMBIGUOUS
+        self.word = None     # Set when a command word ends here
+
+
+class CommandRegistry:
+    """
+    Command words (names and aliases, may contain spaces) compiled into a hash index for
+    exact lookups and a trie for prefixes. A prefix resolves when every word under it
+    belongs to the same command, so "nor" finds north and "use" finds use terminal.
+    Commands added with exact=True stay out of prefix resolution (a stray "e" must not
+    exit), though tab still completes them.
+    """
+
+    def __init__(self):
+        self.commands = []  # In registration order, for help
+        self.index = {}     # word -> Command
+        self.root = _Node()
+
+    def add(self, name, handler, help="", aliases=(), args=False, background=False, exact=False):
+        command = Command(name, handler, help, aliases, args, background, exact)
+        self.commands.append(command)
+        for word in (name, *aliases):
+            self.add_word(word, command)
+        return command
+
+    def add_word(self, word, command):
+        """Make another word run an existing command (e.g. a room-specific alias)"""
+        word = word.lower()
+        if word in self.index:
+            return
+        self.index[word] = command
+        mark = self._mark if not command.exact else lambda node, command: None
+        node = self.root
+        mark(node, command)
+        for char in word:
+            node = node.children.setdefault(char, _Node())
+            mark(node, command)
+        node.word = word
+
+    @staticmethod
+    def _mark(node, command):
+        if node.command is None:
+            node.command = command
+        elif node.command is not command:
+            node.command = AMBIGUOUS
+
+    def extend(self, other):
+        for command in other.commands:
+            self.add(command.name, command.handler, command.help, command.aliases, command.args,
+                     command.background, command.exact)
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def resolve(self, text):
+        """The command an input line names, exactly or by unambiguous prefix; else None"""
+        text = text.lower()
+        command = self.index.get(text)
+        if command is None and text:
+            node = self._find(text)
+            if node is not None and node.command is not AMBIGUOUS:
+                command = node.command
+        return command
+
+    def parse(self, text):
+        """
+        Split an input line into (command, args) for calling handler(target, *args).
+        Whole-line words win ("use terminal"); otherwise the first word may name a command
+        taking arguments ("goto mother", "go to mother"). Command words match in any case;
+        arguments are passed on as typed. Returns (None, ()) when nothing matches.
+        """
+        command = self.resolve(text)
+        if command is not None:
+            return command, ("",) if command.args else ()
+        # Longest head first, so "go to mother" finds "go to" before "go"
+        split = text.rfind(" ")
+        while split > 0:
+            command = self.resolve(text[:split])
+            if command is not None and command.args:
+                return command, (text[split:].strip(),)
+            split = text.rfind(" ", 0, split)
+        return None, ()
+
+    def complete(self, text):
+        """Return (completed text, candidate words) for a tab press"""
+        node = self._find(text.lower())
+        if node is None:
+            return text, []
+        candidates = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.word is not None:
+                candidates.append(current.word)
+            stack.extend(current.children.values())
+        candidates.sort()
+        return commonprefix(candidates), candidates
+
+    def names(self):
+        return [command.name for command in self.commands]
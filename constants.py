@@ -9,6 +9,14 @@ DEGRADED_JITTER_MIN = 4.25
 DEGRADED_JITTER_MAX = 15.96
 
 CURSOR_BLINK_INTERVAL = 0.53
+TYPEWRITER_STEP = 1 / 60 # Frame step the typewriter pacing was tuned at
+
+SIMULATION_STEP = 1 / 60 # Fixed game clock step, whatever the frame rate
+MAX_FRAME_TIME = 0.25 # Longer frames (stalls, debugger) are clamped instead of caught up
+
+FRAME_RATE = 1 / 60
+IDLE_FRAME_RATE = 1 / 10 # Update/draw rate while nothing but cursors and the clock change
+IDLE_DELAY = 2.0 # Seconds without input or animation before dropping to the idle rate
 
 MARGIN_X = 50
 MARGIN_TOP = 100
@@ -36,3 +44,36 @@ SCANLINE_COLOR = (0, 30, 0, 40)
 GLITCH_CHAR_THRESHOLD = 50 # Threshold of system degradation before glitching characters
 GLITCH_CHAR_CHANCE = 0.025 # Chance of glitching characters if threshold met
 GLITCH_CHARS = "▓▒░${!#@^% "
+
+SCROLLBACK_MAX_LINES = 5000 # Oldest lines are dropped past either limit
+SCROLLBACK_MAX_BYTES = 512 * 1024
+
+SYSTEM_TICK = 1.0 # Seconds of game time between ship systems updates
+SYSTEM_DECAY_RATE = 0.002 # Integrity points a component loses per second
+SYSTEM_DECAY_SPREAD = 0.5 # Per-component decay rate varies by ±50%
+SYSTEM_FAULT_CHANCE = 1 / 3600 # Chance per component per second of a sudden fault
+SYSTEM_FAULT_DAMAGE = 10
+SYSTEM_CASCADE_FACTOR = 1.0 # Extra wear per failed sibling component
+SYSTEM_CRITICAL = 30 # Below this a component counts as failed (matches utils.system_checks)
+
+SYSTEM_DEGRADED = 60 # Below this a component shows up in a diagnostic scan
+
+COMMAND_WORKERS = 2 # Threads running long terminal commands (jobs.py)
+JOB_BUFFER = 256 # Output items a command may run ahead of the typewriter
+JOB_POLL_INTERVAL = 0.1 # Worker sleep while a job (e.g. tail -f) has nothing new
+PROGRESS_BAR_WIDTH = 20
+
+LOG_PAGE_BYTES = 64 * 1024 # Logs are read and indexed this much at a time
+TAIL_LINES = 10
+
+SEARCH_HISTORY_LINES = 100_000 # Lines of terminal output kept searchable
+SEARCH_MAX_RESULTS = 100
+
+ROOM_TRAVEL_TIME = 20 # Seconds of game time to walk between adjacent rooms
+ROUTE_CACHE_SIZE = 256 # Shortest-path trees kept, one per origin room
+
+AUTOSAVE_INTERVAL = 60 # Seconds of game time between autosaves (savegame.py)
+
+INPUT_HISTORY_SIZE = 500 # Submitted lines UP/DOWN and Ctrl-R reach back through, per prompt
+
+TEXTURE_BUDGET_BYTES = 64 * 1024 * 1024 # Decoded background textures kept before LRU eviction
@@ -0,0 +1,41 @@
+# frame_cache.py
+from arcade.gl import geometry
+
+
+class FrameCache:
+    """
+    Offscreen copy of a view's last rendered frame. The view passes a frame key (a cheap
+    tuple of everything it shows); while the key is unchanged the cached frame is blitted
+    instead of redrawing the scene.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.framebuffer = None
+        self.quad = None
+
+    def invalidate(self):
+        self.key = None
+
+    def draw(self, window, key, render):
+        """Blit the cached frame, re-rendering it first if key changed. Returns True when redrawn"""
+        ctx = window.ctx
+        size = window.get_framebuffer_size()
+        if self.framebuffer is None or self.framebuffer.size != size:
+            texture = ctx.texture(size, components=4)
+            self.framebuffer = ctx.framebuffer(color_attachments=[texture])
+            self.quad = geometry.quad_2d_fs()
+            self.key = None
+
+        redrawn = key != self.key
+        if redrawn:
+            with self.framebuffer.activate():
+                self.framebuffer.clear(color=window.background_color)
+                render()
+            self.key = key
+
+        # Straight copy: the frame was already blended when it was rendered
+        with ctx.enabled_only():
+            self.framebuffer.color_attachments[0].use(0)
+            self.quad.render(ctx.utility_textured_quad_program)
+        return redrawn
@@ -1,19 +1,135 @@
 # game_state.py
+import random
 from datetime import datetime, timedelta
+from constants import SIMULATION_STEP, MAX_FRAME_TIME
+from utils import rng_state, set_rng_state
+
+# get_timestamp() formats, filled from the cached {date} / {iso_date} / {clock} parts
+TIMESTAMP_FORMATS = {
+    "display": "{date}  SHIP TIME: {clock}",   # 17 DEC 2175  SHIP TIME: 12:00:00
+    "iso": "{iso_date}T{clock}",               # 2175-12-17T12:00:00
+    "log": "[{iso_date} {clock}]",             # [2175-12-17 12:00:00]
+}
+
+
+def _clock(time_of_day):
+    hours, rest = divmod(time_of_day, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
 
 class GameState:
-    def __init__(self):
+    def __init__(self, seed=None, step=SIMULATION_STEP):
+        # Session RNG: every random draw in the game descends from this seed
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+
         # Base date: today (December 17, 2025)
         real_now = datetime(2025, 12, 17)
         # Mission is ~150 years in the future
         self.mission_start_time = real_now + timedelta(days=365.25 * 150)
         self.elapsed_seconds = 0.0
 
-    def get_timestamp(self) -> str:
-        current = self.mission_start_time + timedelta(seconds=self.elapsed_seconds)
-        earth_date = current.strftime("%d %b %Y").upper()
-        ship_time = current.strftime("%H:%M:%S")
-        return f"{earth_date}  SHIP TIME: {ship_time}"
+        # Timestamp cache: the date is reformatted once per ship day, the clock once per second
+        start_day = self.mission_start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start_day = start_day
+        self.start_offset = (self.mission_start_time - start_day).total_seconds()
+        self.cached_second = None
+        self.cached_day = None
+        self.date_parts = {}
+        self.clock = ""
+        self.timestamps = {}  # format name -> string for cached_second
+
+        # Fixed-step clock: frame time accumulates, the simulation runs in whole steps
+        self.step = step
+        self.accumulator = 0.0
+        self.time_scale = 1.0  # e.g. 10 to fast-forward typewriters while testing
+        self.paused = False
+        self.max_frame_time = max(MAX_FRAME_TIME, step)  # A frame can always run at least one step
+        self.subscribers = []  # Called with the step length once per step
+
+    def ship_second(self):
+        """Whole seconds since midnight of the mission start day"""
+        return int(self.start_offset + self.elapsed_seconds)
+
+    def get_timestamp(self, fmt="display") -> str:
+        """Current ship time in one of TIMESTAMP_FORMATS, rebuilt at most once per second"""
+        second = self.ship_second()
+        if second != self.cached_second:
+            self._set_second(second)
+        timestamp = self.timestamps.get(fmt)
+        if timestamp is None:
+            timestamp = TIMESTAMP_FORMATS[fmt].format(clock=self.clock, **self.date_parts)
+            self.timestamps[fmt] = timestamp
+        return timestamp
+
+    def timestamp_at(self, elapsed, fmt="display") -> str:
+        """Ship time at another point of the session (e.g. when a terminal powered on); not cached"""
+        day, time_of_day = divmod(int(self.start_offset + elapsed), 86400)
+        return TIMESTAMP_FORMATS[fmt].format(clock=_clock(time_of_day), **self._date_parts(day))
+
+    def _date_parts(self, day):
+        date = self.start_day + timedelta(days=day)
+        return {"date": date.strftime("%d %b %Y").upper(), "iso_date": date.strftime("%Y-%m-%d")}
+
+    def _set_second(self, second):
+        day, time_of_day = divmod(second, 86400)
+        if day != self.cached_day:
+            self.date_parts = self._date_parts(day)
+            self.cached_day = day
+        self.clock = _clock(time_of_day)
+        self.timestamps = {}
+        self.cached_second = second
+
+    def frame_key(self):
+        """The timestamp only changes once per ship-time second"""
+        return self.ship_second()
+
+    def subscribe(self, callback):
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def advance(self, delta_time: float) -> int:
+        """Feed one frame's real time into the clock; returns the number of steps run"""
+        if self.paused:
+            return 0
+        # A stall is dropped rather than replayed as a burst of steps
+        self.accumulator += min(delta_time, self.max_frame_time) * self.time_scale
+
+        steps = 0
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            self.update_time(self.step)
+            # Copy: a subscriber may unsubscribe itself (e.g. a terminal logging out)
+            for callback in list(self.subscribers):
+                callback(self.step)
+            steps += 1
+        return steps
 
     def update_time(self, delta_time: float):
-        self.elapsed_seconds += delta_time
\ No newline at end of file
+        self.elapsed_seconds += delta_time
+
+    def snapshot(self):
+        return {"seed": self.seed, "rng": rng_state(self.rng), "elapsed": self.elapsed_seconds,
+                "accumulator": self.accumulator, "paused": self.paused}
+
+    def restore(self, state):
+        """Resume a saved clock; the session must have been created with the saved seed"""
+        if state["seed"] != self.seed:
+            raise ValueError(f"save is for seed {state['seed']}, session has {self.seed}")
+        set_rng_state(self.rng, state["rng"])
+        self.elapsed_seconds = state["elapsed"]
+        self.accumulator = state["accumulator"]
+        self.paused = state["paused"]
+        self.cached_second = None
+
+    def spawn_rng(self):
+        """Independent, seed-derived RNG for one subsystem (e.g. a terminal)"""
+        return random.Random(self.rng.getrandbits(64))
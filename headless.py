@@ -0,0 +1,118 @@
+# headless.py
+# Runs the game simulation without a window or GL context: feed it delta_time ticks and
+# key events, read back terminal displayed_text / room messages. Used for CI and benchmarks.
+import time
+from collections import deque
+import keys
+from constants import SIMULATION_STEP, INPUT_HISTORY_SIZE
+from terminal_registry import TerminalRegistry
+from ship_data import load_ship
+from ship_index import RoomMap
+from navigation import NavigationGraph
+from game_state import GameState
+from location_model import LocationModel
+from terminal.terminal_model import TerminalModel
+
+FAST_STEP = 1.0  # Clock step for CI runs: a second of typewriter output per tick
+
+
+class HeadlessSession:
+    """
+    step is the game clock step. The default matches the window, for replays; CI can pass
+    a coarser one (FAST_STEP) so typewriter delays cost a few ticks instead of one per
+    frame. Typewriter pacing is compiled up front, so the text typed is the same either way.
+    """
+
+    def __init__(self, seed=None, start=None, step=SIMULATION_STEP):
+        self.game_state = GameState(seed, step=step)
+        self.ship = load_ship()
+        self.navigation = NavigationGraph(self.ship)
+
+        # Same registry as MyGame, so a seed gives the same RNG streams
+        self.terminals = TerminalRegistry(
+            self.ship.terminals, self.game_state,
+            lambda spec, build, rng: TerminalModel(build, rng=rng),
+            self.navigation
+        )
+
+        self.room_history = deque(maxlen=INPUT_HISTORY_SIZE)  # One command history for every room
+        self.locations = RoomMap(self.ship, self.make_location)
+        self.current = self.locations[start or self.ship.start]
+
+    def make_location(self, room):
+        loc = LocationModel(room, self.terminals, self.game_state)
+        loc.navigate = self.navigate
+        loc.navigation = self.navigation
+        loc.input.history = self.room_history
+        return loc
+
+    def navigate(self, target_id):
+        target = self.locations.get(target_id)
+        if target:
+            self.current = target
+        return target
+
+    def tick(self, delta_time=None, frames=1):
+        # Mirrors MyGame.on_update: the game clock steps whatever is subscribed
+        for _ in range(frames):
+            self.game_state.advance(delta_time or self.game_state.step)
+
+    def press(self, key, modifiers=0):
+        self.current.key_press(key, modifiers)
+        # Handled by the window in MyGame.on_key_press, after the view
+        if key == keys.PAUSE:
+            self.game_state.toggle_pause()
+
+    def type_text(self, text):
+        self.current.type_text(text)
+
+    def paste(self, text):
+        self.current.paste(text)
+
+    def type_command(self, text):
+        """Type a line at whichever prompt is active and press ENTER"""
+        self.type_text(text)
+        self.press(keys.ENTER)
+
+    def run_until_idle(self, max_steps=100_000):
+        """Step the clock until the active terminal (if any) is waiting at its prompt"""
+        game_state = self.game_state
+        for _ in range(max_steps):
+            terminal = self.current.terminal
+            if not (self.current.terminal_active and terminal):
+                return
+            if terminal.input_mode and not terminal.typing_response:
+                return
+            game_state.advance(game_state.step)
+
+    @property
+    def messages(self):
+        return self.current.messages
+
+    def displayed_text(self, name="mother"):
+        return list(self.terminals[name].displayed_text)
+
+
+def run_session(seed=None, step=FAST_STEP):
+    """One scripted visit: walk to MOTHER, boot it, run a few commands, walk back"""
+    session = HeadlessSession(seed, step=step)
+    session.type_command("look")
+    session.type_command("north")
+    session.type_command("use terminal")
+    session.run_until_idle()
+    for command in ("help", "status", "exit"):
+        session.type_command(command)
+        session.run_until_idle()
+    session.type_command("south")
+    return session
+
+
+if __name__ == "__main__":
+    sessions = 200
+    start = time.perf_counter()
+    for _ in range(sessions):
+        session = run_session()
+    elapsed = time.perf_counter() - start
+    print("\n".join(session.displayed_text()))
+    print("\n".join(session.messages))
+    print(f"{sessions} sessions in {elapsed:.2f}s ({sessions / elapsed:.0f}/s)")
@@ -0,0 +1,184 @@
+# input_line.py
+from collections import deque
+
+import keys
+from constants import INPUT_HISTORY_SIZE
+
+
+def printable(text):
+    """Text without control characters (on_text also delivers ENTER as a carriage return)"""
+    return text if text.isprintable() else "".join(char for char in text if char.isprintable())
+
+
+def split_paste(text):
+    """Pasted text as (line, submit) pairs: every line break in it submits the line before it"""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    pairs = deque((line, True) for line in lines[:-1])
+    if lines[-1]:
+        pairs.append((lines[-1], False))
+    return pairs
+
+
+# Keys that end a reverse search keeping its match
+ACCEPT_KEYS = {keys.ENTER, keys.DELETE, keys.LEFT, keys.RIGHT, keys.HOME, keys.END, keys.UP, keys.DOWN}
+
+
+class InputLine:
+    """
+    The line being typed at a prompt (a room's or a terminal's), with a cursor that can
+    move inside it. A gap buffer: the characters before the cursor in one list and the
+    ones after it in another, reversed, so typing, deleting and moving by one character
+    cost the same anywhere in the line, and inserting a paste is one extend.
+
+    Submitted lines go into a bounded history that UP/DOWN step through and Ctrl-R
+    searches backwards (typing narrows the search, Ctrl-R again finds older matches,
+    ENTER runs the match, Escape or Ctrl-C gives the line back as it was).
+    """
+
+    def __init__(self, history=None):
+        self.before = []
+        self.after = []  # Reversed: after[-1] is the character right of the cursor
+        self._text = ""
+        # Shared by every room's prompt; a terminal keeps its own
+        self.history = history if history is not None else deque(maxlen=INPUT_HISTORY_SIZE)
+        self.recall = None  # History index shown by UP/DOWN, None when not browsing
+        self.draft = ""  # The line as typed, given back after browsing or searching
+        self.query = None  # Reverse search text while Ctrl-R is active
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self.before)
+            if self.after:
+                self._text += "".join(reversed(self.after))
+        return self._text
+
+    @property
+    def cursor(self):
+        return len(self.before)
+
+    @property
+    def searching(self):
+        return self.query is not None
+
+    @property
+    def display(self):
+        """What the prompt shows after its "> ": the line, or the reverse search in progress"""
+        if self.query is None:
+            return self.text
+        return f"(reverse-i-search)'{self.query}': {self.text}"
+
+    @property
+    def display_cursor(self):
+        return len(self.display) - len(self.text) + self.cursor
+
+    def set(self, text):
+        """Replace the line, cursor at the end"""
+        self.before = list(text)
+        self.after = []
+        self._text = text
+
+    def insert(self, text):
+        if self.query is not None:
+            self.query += text
+            self.search(len(self.history) - 1 if self.recall is None else self.recall)
+            return
+        self.before.extend(text)
+        self._text = None
+
+    def backspace(self):
+        if self.query is not None:
+            self.query = self.query[:-1]
+            self.search(len(self.history) - 1)
+        elif self.before:
+            self.before.pop()
+            self._text = None
+
+    def delete(self):
+        if self.after:
+            self.after.pop()
+            self._text = None
+
+    def move(self, steps):
+        """Move the cursor by steps (negative: left); the text doesn't change"""
+        while steps < 0 and self.before:
+            self.after.append(self.before.pop())
+            steps += 1
+        while steps > 0 and self.after:
+            self.before.append(self.after.pop())
+            steps -= 1
+
+    def submit(self):
+        """The finished line (a search accepts its match); it goes into the history and the line empties"""
+        text = self.text
+        if text.strip() and (not self.history or self.history[-1] != text):
+            self.history.append(text)
+        self.set("")
+        self.recall = self.query = None
+        return text
+
+    def browse(self, step):
+        """UP (-1) / DOWN (1) through the history; going past the newest gives back the draft"""
+        if self.recall is None:
+            if step > 0 or not self.history:
+                return
+            self.draft = self.text
+            self.recall = len(self.history)
+        self.recall = max(0, self.recall + step)
+        if self.recall >= len(self.history):
+            self.recall = None
+            self.set(self.draft)
+        else:
+            self.set(self.history[self.recall])
+
+    def start_search(self):
+        if self.query is None:
+            self.draft = self.text
+            self.query = ""
+            self.recall = None
+        elif self.recall:
+            self.search(self.recall - 1)  # Ctrl-R again: the next older match
+
+    def search(self, start):
+        """Show the newest history entry at or before `start` containing the query"""
+        for index in range(start, -1, -1):
+            if self.query in self.history[index]:
+                self.recall = index
+                self.set(self.history[index])
+                return
+
+    def end_search(self, accept=True):
+        self.query = None
+        self.recall = None
+        if not accept:
+            self.set(self.draft)
+
+    def key_press(self, key, modifiers):
+        """Editing keys; returns False for anything else (ENTER, printable keys) so the prompt handles it"""
+        ctrl = modifiers & keys.MOD_CTRL
+        if self.query is not None:
+            if key == keys.ESCAPE or (ctrl and key in (keys.C, keys.G)):
+                self.end_search(accept=False)
+                return True
+            if key in ACCEPT_KEYS:
+                self.end_search()  # ENTER runs the match, moving the cursor edits it
+        if ctrl and key == keys.R:
+            self.start_search()
+            return True
+        action = EDITING_KEYS.get(key)
+        if action is None:
+            return False
+        action(self)
+        return True
+
+
+EDITING_KEYS = {
+    keys.BACKSPACE: InputLine.backspace,
+    keys.DELETE: InputLine.delete,
+    keys.LEFT: lambda line: line.move(-1),
+    keys.RIGHT: lambda line: line.move(1),
+    keys.HOME: lambda line: line.move(-line.cursor),
+    keys.END: lambda line: line.move(len(line.after)),
+    keys.UP: lambda line: line.browse(-1),
+    keys.DOWN: lambda line: line.browse(1),
+}
@@ -0,0 +1,111 @@
+# jobs.py
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import COMMAND_WORKERS, JOB_BUFFER, JOB_POLL_INTERVAL
+
+_DONE = object()
+
+
+class Job:
+    """
+    A long-running terminal command. Its handler returns an iterator of output: a str is
+    a line, a float in [0, 1] reports progress and None means nothing new yet (tail -f).
+    Given an executor, the iterator is consumed on a worker thread and the terminal drains
+    the output each frame, so the frame never waits on it. Anything a handler needs from
+    live game state should be copied before it returns.
+
+    The worker blocks once JOB_BUFFER items are waiting, so a scan can't run far ahead of
+    the typewriter. Cancelling is cooperative: the worker stops at the iterator's next yield.
+    """
+
+    def __init__(self, name, output):
+        self.name = name
+        self.iterator = iter(output)
+        self.queue = None
+        self.cancelled = threading.Event()
+        self.progress = None  # Last reported fraction, None until the handler reports one
+        self.finished = False
+
+    def start(self, executor=None):
+        """Without an executor the terminal pulls output itself each frame (deterministic, for headless runs)"""
+        if executor is not None:
+            self.queue = queue.Queue(JOB_BUFFER)
+            executor.submit(self.run)
+
+    def put(self, item):
+        """Hand an item to the terminal, waiting for room; False once cancelled"""
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=JOB_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run(self):
+        try:
+            for item in self.iterator:
+                if item is None:
+                    time.sleep(JOB_POLL_INTERVAL)
+                    if self.cancelled.is_set():
+                        break
+                elif not self.put(item):
+                    break
+        except Exception as e:
+            self.put(f"{self.name}: {e}")
+        finally:
+            self._close()
+            self.put(_DONE)
+
+    def _close(self):
+        close = getattr(self.iterator, "close", None)
+        if close:
+            close()
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.queue is None:
+            self._close()
+
+    def collect(self):
+        """Take the lines produced so far (main thread); updates progress and finished"""
+        lines = []
+        if self.queue is None:
+            self._pull(lines)
+            return lines
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._take(item, lines)
+        return lines
+
+    def _pull(self, lines):
+        # Inline: run the iterator here until a buffer's worth or until it has nothing new
+        try:
+            for _ in range(JOB_BUFFER):
+                item = next(self.iterator)
+                if item is None:
+                    break
+                self._take(item, lines)
+        except StopIteration:
+            self.finished = True
+        except Exception as e:
+            lines.append(f"{self.name}: {e}")
+            self.finished = True
+
+    def _take(self, item, lines):
+        if item is _DONE:
+            self.finished = True
+        elif isinstance(item, float):
+            self.progress = item
+        else:
+            lines.append(item)
+
+
+def command_executor():
+    return ThreadPoolExecutor(max_workers=COMMAND_WORKERS, thread_name_prefix="terminal-command")
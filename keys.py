@@ -0,0 +1,32 @@
+# keys.py
+# Key codes the simulation models need. Same values as arcade.key (pyglet), kept here
+# so the models never import arcade — importing pyglet.window needs a display.
+ESCAPE = 65307
+ENTER = 65293
+BACKSPACE = 65288
+PAGEUP = 65365
+PAGEDOWN = 65366
+TAB = 65289
+SPACE = 32
+DOWN = 65364
+UP = 65362
+LEFT = 65361
+RIGHT = 65363
+HOME = 65360
+END = 65367
+DELETE = 65535
+PAUSE = 65299
+B = 98
+C = 99
+G = 103
+Q = 113
+R = 114
+V = 118
+
+MOD_SHIFT = 1
+MOD_CTRL = 2
+
+
+def typed(key, modifiers):
+    """Printable keys: the window also gets them as on_text, shifted and in the user's layout"""
+    return 32 <= key <= 126 and not modifiers & MOD_CTRL
@@ -0,0 +1,112 @@
+# location_layout.py
+import arcade
+from pyglet.graphics import Batch
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT,
+    TEXT_COLOR, FONT_NAME_PRIMARY, FONT_SIZE_DEFAULT, LINE_HEIGHT_MULTIPLIER
+)
+
+DESCRIPTION_GAP = 19  # Space between wrapped description paragraphs
+MESSAGE_GAP = 11      # Space between wrapped messages
+MESSAGE_FONT_SIZE = 15
+VISIBLE_MESSAGES = 10
+
+
+class LocationLayout:
+    """
+    Retained text for a Location's side panel. Title and description are wrapped and
+    laid out once; the message log is rebuilt only when messages change; the timestamp
+    and prompt are the only per-frame updates. Everything draws in one batch.
+    """
+
+    def __init__(self, data, text_section):
+        self.batch = Batch()
+        self.left = text_section.left + 30
+        self.wrap_width = text_section.width - 60
+
+        self.timestamp = arcade.Text(
+            "",
+            SCREEN_WIDTH - 30, SCREEN_HEIGHT - 40,
+            arcade.color.DARK_GREEN, 14,
+            anchor_x="right", font_name=FONT_NAME_PRIMARY,
+            batch=self.batch
+        )
+
+        self.title = arcade.Text(
+            data.name,
+            self.left, SCREEN_HEIGHT - 70,
+            arcade.color.LIGHT_GREEN, 36,
+            bold=True, font_name=FONT_NAME_PRIMARY,
+            batch=self.batch
+        )
+
+        # Description: wrapped once, stacked by the real wrapped height
+        self.description = []
+        y = SCREEN_HEIGHT - 160
+        for line in data.description:
+            text = self._wrapped(line, y, TEXT_COLOR, FONT_SIZE_DEFAULT)
+            self.description.append(text)
+            y -= self._height(text, FONT_SIZE_DEFAULT) + DESCRIPTION_GAP
+
+        self.prompt = arcade.Text(
+            "> ",
+            self.left, 120,
+            TEXT_COLOR, FONT_SIZE_DEFAULT + 6,
+            font_name=FONT_NAME_PRIMARY,
+            batch=self.batch
+        )
+
+        # Message log: rebuilt when the model's message count changes, and kept above the prompt
+        self.message_texts = []
+        self.message_count = None
+        self.messages_top = text_section.height // 2 + 100
+        self.messages_bottom = self.prompt.top + MESSAGE_GAP
+
+    def _wrapped(self, value, y, color, font_size):
+        return arcade.Text(
+            value,
+            self.left, y,
+            color, font_size,
+            font_name=FONT_NAME_PRIMARY,
+            multiline=True,
+            width=self.wrap_width,
+            batch=self.batch
+        )
+
+    def _height(self, text, font_size):
+        # Blank lines have no content height but should still take up a line
+        return text.content_height or int(font_size * LINE_HEIGHT_MULTIPLIER)
+
+    def sync_messages(self, messages):
+        if len(messages) == self.message_count:
+            return
+        self.message_count = len(messages)
+
+        for text in self.message_texts:
+            text.batch = None
+        self.message_texts = []
+
+        # Newest first until the band is full, then lay out oldest-to-newest top down
+        available = self.messages_top - self.messages_bottom
+        for msg in reversed(messages[-VISIBLE_MESSAGES:]):
+            text = self._wrapped(msg, 0, arcade.color.CYAN, MESSAGE_FONT_SIZE)
+            needed = self._height(text, MESSAGE_FONT_SIZE) + MESSAGE_GAP
+            if needed > available and self.message_texts:
+                text.batch = None
+                break
+            available -= needed
+            self.message_texts.insert(0, text)
+
+        y = self.messages_top
+        for text in self.message_texts:
+            text.y = y
+            y -= self._height(text, MESSAGE_FONT_SIZE) + MESSAGE_GAP
+
+    def update(self, timestamp, messages, prompt):
+        # arcade.Text skips the relayout when the value is unchanged
+        self.timestamp.value = timestamp
+        self.prompt.value = prompt
+        self.sync_messages(messages)
+
+    def draw(self):
+        self.batch.draw()
@@ -0,0 +1,203 @@
+# location_model.py
+import keys
+from commands import CommandRegistry
+from input_line import InputLine, printable, split_paste
+from navigation import format_travel_time
+
+# Short forms every exit gets without listing them in the ship data
+DIRECTION_ALIASES = {
+    "north": ("n", "go north"), "south": ("s", "go south"),
+    "east": ("e", "go east"), "west": ("w", "go west"),
+    "up": ("u", "go up"), "down": ("d", "go down"),
+}
+
+
+class LocationModel:
+    """
+    Simulation state of a room: messages, the prompt and the attached terminal.
+    No arcade imports, so it runs without a window (see headless.py). One exists per
+    visited room, so it is kept small; the arcade view drawing it is pooled (LocationPool).
+    """
+    __slots__ = ("data", "game_state", "input", "messages", "navigate",
+                 "terminals", "terminal_name", "_terminal", "terminal_active", "_commands",
+                 "navigation")
+
+    def __init__(self, data, terminals_dict, game_state):
+        self.data = data
+        self.game_state = game_state
+
+        self.input = InputLine()  # The owner may hand every room one shared history
+        self.messages = []
+
+        # Called with a room id when the player walks out; returns the target LocationModel or None
+        self.navigate = None
+        self.navigation = None  # NavigationGraph for goto, set by the owner
+
+        # Terminal state: resolved on first use, so an unvisited terminal is never built
+        self.terminals = terminals_dict
+        self.terminal_name = data.terminal
+        self._terminal = None
+
+        self.terminal_active = False
+        self._commands = None
+
+    @property
+    def commands(self):
+        """This room's verbs, compiled on first input: exits, terminal access, then the shared ones"""
+        if self._commands is None:
+            commands = CommandRegistry()
+            by_target = {}
+            for word, target_id in self.data.exits.items():
+                by_target.setdefault(target_id, []).append(word)
+            for target_id, words in by_target.items():
+                aliases = [alias for word in words for alias in (word, *DIRECTION_ALIASES.get(word, ()))]
+                commands.add(words[0], lambda loc, target_id=target_id: loc.walk(target_id), aliases=aliases[1:])
+            if self.data.access_commands and self.terminal_name:
+                access = self.data.access_commands
+                commands.add(access[0], LocationModel.activate_terminal, aliases=access[1:])
+            commands.extend(ROOM_COMMANDS)
+            self._commands = commands
+        return self._commands
+
+    @property
+    def current_input(self):
+        return self.input.text
+
+    @current_input.setter
+    def current_input(self, text):
+        self.input.set(text)
+
+    @property
+    def terminal(self):
+        if self._terminal is None and self.terminal_name and self.terminal_name in self.terminals:
+            # Values may be models or views holding one
+            terminal = self.terminals[self.terminal_name]
+            self._terminal = getattr(terminal, "model", terminal)
+            self._terminal.on_exit_callback = self.deactivate_terminal
+        return self._terminal
+
+    def activate_terminal(self):
+        if self.terminal:
+            self.terminal_active = True
+            # Off screen the terminal isn't ticked: jump it to now, then run it on the game clock
+            self.terminal.catch_up(self.game_state.elapsed_seconds)
+            self.game_state.subscribe(self.terminal.update)
+            self.messages.append("Console initializing...")
+
+    def deactivate_terminal(self):
+        self.terminal_active = False
+        if self.terminal:
+            self.game_state.unsubscribe(self.terminal.update)
+        self.messages.append("Terminal session ended. Screen powers down.")
+
+    def snapshot(self):
+        return {"messages": list(self.messages), "current_input": self.current_input,
+                "terminal_active": self.terminal_active}
+
+    def restore(self, state):
+        self.messages = state["messages"]
+        self.current_input = state["current_input"]
+        # The terminal restores its own clock, so it rejoins the game clock without catching up
+        self.terminal_active = state["terminal_active"] and self.terminal is not None
+        if self.terminal_active:
+            self.game_state.subscribe(self.terminal.update)
+
+    @property
+    def idle(self):
+        """Nothing animates but the prompt cursor and the clock"""
+        return not (self.terminal_active and self.terminal) or self.terminal.idle
+
+    def key_press(self, key, modifiers):
+        if self.terminal_active and self.terminal:
+            self.terminal.key_press(key, modifiers)
+            return
+
+        if key == keys.ENTER:
+            self.submit()
+        elif key == keys.TAB:
+            completed, candidates = self.commands.complete(self.current_input)
+            if len(completed) > len(self.current_input):
+                self.current_input = completed
+            elif len(candidates) > 1:
+                self.messages.append("  ".join(candidates))
+        elif keys.typed(key, modifiers):
+            self.input.insert(chr(key))
+        else:
+            self.input.key_press(key, modifiers)
+
+    def type_text(self, text):
+        """Text from the keyboard (the window's on_text); the terminal gets it while in use"""
+        if self.terminal_active and self.terminal:
+            self.terminal.type_text(text)
+        else:
+            self.input.insert(printable(text))
+
+    def paste(self, text):
+        """Each line break runs the line so far, wherever the lines before it took the player"""
+        pasted = split_paste(text)
+        room = self
+        while pasted:
+            if room.terminal_active and room.terminal:
+                room.terminal.feed(pasted)
+                return
+            line, submit = pasted.popleft()
+            room.input.insert(printable(line))
+            if submit:
+                room = room.submit() or room
+
+    def submit(self):
+        """Run the typed line; returns the room it moved the player to, if any"""
+        cmd = self.input.submit().strip().lower()
+        self.messages.append(f"> {cmd}")
+
+        command, args = self.commands.parse(cmd)
+        if command is None:
+            self.messages.append("I don't understand that.")
+            return None
+        return command.handler(self, *args)
+
+    def walk(self, target_id):
+        if self.navigation and not self.navigation.passable(self.data.id, target_id):
+            self.messages.append("The way is sealed.")
+            return
+        target_loc = self.navigate(target_id) if self.navigate else None
+        if target_loc:
+            target_loc.messages.append("You enter the chamber.")
+        else:
+            self.messages.append("You can't go that way.")
+        return target_loc
+
+    def goto(self, destination):
+        if not (destination and self.navigation):
+            self.messages.append("Go where?")
+            return
+        target_id = self.navigation.find(destination)
+        if target_id is None:
+            self.messages.append(f"There's nowhere called '{destination}' aboard.")
+            return
+        if target_id == self.data.id:
+            self.messages.append("You're already here.")
+            return
+        route = self.navigation.route(self.data.id, target_id)
+        if route is None:
+            self.messages.append(f"There's no way through to the {self.navigation.name(target_id)}.")
+            return
+        target_loc = self.navigate(target_id) if self.navigate else None
+        if target_loc:
+            target_loc.messages.append(
+                f"You make your way {', '.join(route.exits)} ({format_travel_time(route.travel_time)}).")
+            target_loc.messages.append("You enter the chamber.")
+        return target_loc
+
+    def look(self):
+        self.messages.extend(self.data.description)
+
+    def help(self):
+        self.messages.append(f"Commands: {', '.join(self.commands.names())}")
+
+
+# Verbs every room understands, after its own exits and terminal
+ROOM_COMMANDS = CommandRegistry()
+ROOM_COMMANDS.add("look", LocationModel.look, aliases=("l",))
+ROOM_COMMANDS.add("goto", LocationModel.goto, aliases=("go to",), args=True)
+ROOM_COMMANDS.add("help", LocationModel.help)
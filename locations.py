@@ -1,66 +1,31 @@
 # locations.py
 import arcade
-from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT,
-    TEXT_COLOR, BACKGROUND_COLOR, FONT_NAME_PRIMARY, FONT_SIZE_DEFAULT
-)
-
-SHIP_LOCATIONS = [
-    {
-        "id": "corridor",
-        "name": "Main Corridor",
-        "description": [
-            "You stand in a long, dimly lit corridor aboard the derelict salvage vessel.",
-            "Flickering emergency lights cast harsh shadows on rusted bulkheads.",
-            "Cold vapor hisses from cracked pipes overhead.",
-            "To the north, a heavy door bears the label: MOTHER CORE ACCESS.",
-        ],
-        "background": "resources/images/corridor.png",
-        "exits": {"north": "mother_room", "n": "mother_room", "go north": "mother_room"},
-        "terminal": None,
-    },
-    {
-        "id": "mother_room",
-        "name": "Mother Core Chamber",
-        "description": [
-            "You stand in the heart of the ship — the MOTHER core chamber.",
-            "A massive curved console dominates the room, its screen dark and silent.",
-            "Alien glyphs are etched into the metal. The air is thick with static.",
-            "This is the primary AI interface.",
-            "",
-            "You can 'use terminal' or 'access console' to interact with it.",
-            "Type 'south' or 'leave' to return to the corridor.",
-        ],
-        "background": "resources/images/mother_room.png",
-        "exits": {"south": "corridor", "s": "corridor", "leave": "corridor", "back": "corridor"},
-        "terminal": "mother",
-        "access_commands": ["use terminal", "access terminal", "use console", "access console", "terminal", "console"],
-    },
-]
+import keys
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BACKGROUND_COLOR
+from profiling import PROFILER
+from texture_cache import TextureCache
+from location_layout import LocationLayout
+from frame_cache import FrameCache
+
+LOCATION_POOL_SIZE = 2  # Current room plus the one just left, so walking back is free
+
 
 class Location(arcade.View):
-    def __init__(self, data, terminals_dict, game_state):
+    """Draws whichever LocationModel it is bound to; views are pooled (LocationPool)"""
+
+    def __init__(self, terminals_dict, game_state, texture_cache=None):
         super().__init__()
-        self.data = data
         self.terminals_dict = terminals_dict
         self.game_state = game_state
 
-        self.current_input = ""
-        self.messages = []
+        # Simulation lives in the model; this view only draws it and forwards events
+        self.model = None
+        self.data = None
 
         # === Background SpriteList (correct for Arcade 3.x) ===
+        # Filled on entry from the shared texture cache, emptied on exit so unused rooms hold no texture
+        self.texture_cache = texture_cache or TextureCache()
         self.background_list = arcade.SpriteList()
-        try:
-            bg_sprite = arcade.Sprite(data["background"])
-            # Scale to fill height, preserve aspect
-            scale = SCREEN_HEIGHT / bg_sprite.height
-            bg_sprite.scale = scale
-            # Center in full screen (sections don't affect sprite positioning)
-            bg_sprite.center_x = SCREEN_WIDTH // 2
-            bg_sprite.center_y = SCREEN_HEIGHT // 2
-            self.background_list.append(bg_sprite)
-        except Exception as e:
-            print(f"Background load failed: {e}")
 
         # Section Manager (optional for future event routing, but useful)
         self.section_manager = arcade.SectionManager(self)
@@ -75,140 +40,140 @@ class Location(arcade.View):
         self.text_section = arcade.Section(left=text_left, bottom=0, width=SCREEN_WIDTH - text_left, height=SCREEN_HEIGHT)
         self.section_manager.add_section(self.text_section)
 
-        # Terminal state
-        self.terminal_instance = None
-        terminal_name = data.get("terminal")
-        if terminal_name and terminal_name in terminals_dict:
-            self.terminal_instance = terminals_dict[terminal_name]
-            self.terminal_instance.previous_view = self
-            self.terminal_instance.on_exit_callback = self.deactivate_terminal
-
-        self.terminal_active = False
-
-    def activate_terminal(self):
-        if self.terminal_instance:
-            self.terminal_active = True
-            self.messages.append("Console initializing...")
+        # Side-panel text, laid out on bind and updated incrementally
+        self.layout = None
+        self.frame_cache = FrameCache()
+
+        # Terminal view drawn on top while the model's terminal is active
+        self._terminal_instance = None
+
+    def bind(self, model):
+        """Show another room with this view"""
+        self.model = model
+        self.data = model.data
+        self.layout = LocationLayout(model.data, self.text_section)
+        self.background_list.clear()
+        self.frame_cache.invalidate()
+        self._terminal_instance = None
+
+    @property
+    def terminal_instance(self):
+        # Looked up on first use, so the terminal is only built once someone looks at it
+        name = self.data.terminal
+        if self._terminal_instance is None and name and name in self.terminals_dict:
+            self._terminal_instance = self.terminals_dict[name]
+            self._terminal_instance.previous_view = self
+        return self._terminal_instance
+
+    def on_show_view(self):
+        self.load_background()
+        # Warm the rooms the player can walk to next, straight from the index (no views built).
+        # Only a prefetch: a window without a ship (a bare benchmark or test window) skips it.
+        ship = getattr(self.window, "ship", None)
+        if ship is not None:
+            neighbours = (ship.room(room_id) for room_id in set(self.data.exits.values()))
+            self.texture_cache.prefetch([room.background for room in neighbours if room])
+
+    def on_hide_view(self):
+        self.background_list.clear()
+
+    def load_background(self):
+        if self.background_list:
+            return
+        try:
+            bg_sprite = arcade.Sprite(self.texture_cache.get(self.data.background))
+            # Scale to fill height, preserve aspect
+            scale = SCREEN_HEIGHT / bg_sprite.height
+            bg_sprite.scale = scale
+            # Center in full screen (sections don't affect sprite positioning)
+            bg_sprite.center_x = SCREEN_WIDTH // 2
+            bg_sprite.center_y = SCREEN_HEIGHT // 2
+            self.background_list.append(bg_sprite)
+        except Exception as e:
+            print(f"Background load failed: {e}")
 
-    def deactivate_terminal(self):
-        self.terminal_active = False
-        self.messages.append("Terminal session ended. Screen powers down.")
+    @property
+    def idle(self):
+        return self.model.idle
 
-    def on_update(self, delta_time: float):
-        self.game_state.update_time(delta_time)
-        if self.terminal_active and self.terminal_instance:
-            self.terminal_instance.on_update(delta_time)
+    def cursor(self):
+        return "█" if int(self.game_state.elapsed_seconds * 2) % 2 else " "
 
     def on_draw(self):
-        self.clear()
-        arcade.set_background_color(BACKGROUND_COLOR)
+        # The terminal covers the whole screen and keeps its own frame cache
+        if self.model.terminal_active and self.terminal_instance:
+            self.terminal_instance.on_draw()
+            return
 
-        # Draw background (full screen)
-        self.background_list.draw()
-
-        # Dark overlay on background area
-        arcade.draw_lrbt_rectangle_filled(
-            self.bg_section.left, self.bg_section.right,
-            self.bg_section.bottom, self.bg_section.top,
-            (0, 0, 0, 140)
-        )
-
-        # Dark panel on text area
-        arcade.draw_lrbt_rectangle_filled(
-            self.text_section.left, self.text_section.right,
-            self.text_section.bottom, self.text_section.top,
-            (0, 0, 0, 200)
-        )
-
-        # Text content (only when terminal inactive)
-        if not self.terminal_active:
-            # Timestamp
-            timestamp = self.game_state.get_timestamp()
-            arcade.draw_text(
-                timestamp,
-                SCREEN_WIDTH - 30, SCREEN_HEIGHT - 40,
-                arcade.color.DARK_GREEN, 14,
-                anchor_x="right", font_name=FONT_NAME_PRIMARY
+        arcade.set_background_color(BACKGROUND_COLOR)
+        model = self.model
+        key = (self.game_state.frame_key(), self.cursor(), model.input.display, model.input.cursor,
+               len(model.messages), len(self.background_list))
+        self.frame_cache.draw(self.window, key, self.render)
+        PROFILER.count_draws()
+
+    def render(self):
+        with PROFILER.phase("blit"):
+            # Draw background (full screen)
+            self.background_list.draw()
+
+            # Dark overlay on background area
+            arcade.draw_lrbt_rectangle_filled(
+                self.bg_section.left, self.bg_section.right,
+                self.bg_section.bottom, self.bg_section.top,
+                (0, 0, 0, 140)
             )
 
-            # Room title
-            arcade.draw_text(
-                self.data["name"],
-                self.text_section.left + 30, SCREEN_HEIGHT - 70,
-                arcade.color.LIGHT_GREEN, 36,
-                bold=True, font_name=FONT_NAME_PRIMARY
+            # Dark panel on text area
+            arcade.draw_lrbt_rectangle_filled(
+                self.text_section.left, self.text_section.right,
+                self.text_section.bottom, self.text_section.top,
+                (0, 0, 0, 200)
             )
+            PROFILER.count_draws(3)
 
-            # Description
-            y = SCREEN_HEIGHT - 160
-            for line in self.data["description"]:
-                arcade.draw_text(
-                    line,
-                    self.text_section.left + 30, y,
-                    TEXT_COLOR, FONT_SIZE_DEFAULT,
-                    font_name=FONT_NAME_PRIMARY,
-                    width=self.text_section.width - 60
-                )
-                y -= 45
-
-            # Messages
-            y = self.text_section.height // 2 + 100
-            for msg in self.messages[-10:]:
-                arcade.draw_text(
-                    msg,
-                    self.text_section.left + 30, y,
-                    arcade.color.CYAN, 15,
-                    font_name=FONT_NAME_PRIMARY,
-                    width=self.text_section.width - 60
-                )
-                y -= 35
-
-            # Input prompt
-            cursor = "█" if int(self.game_state.elapsed_seconds * 2) % 2 else " "
-            arcade.draw_text(
-                f"> {self.current_input}{cursor}",
-                self.text_section.left + 30, 120,
-                TEXT_COLOR, FONT_SIZE_DEFAULT + 6,
-                font_name=FONT_NAME_PRIMARY
+        with PROFILER.phase("text_layout"):
+            self.layout.update(
+                self.game_state.get_timestamp(),
+                self.model.messages,
+                self.prompt_text()
             )
+        with PROFILER.phase("blit"):
+            self.layout.draw()
+            PROFILER.count_draws()
 
-        # Full terminal when active
-        if self.terminal_active and self.terminal_instance:
-            self.terminal_instance.on_draw()
+    def prompt_text(self):
+        text, cursor = self.model.input.display, self.model.input.display_cursor
+        return f"> {text[:cursor]}{self.cursor()}{text[cursor:]}"
 
     def on_key_press(self, key, modifiers):
-        if self.terminal_active and self.terminal_instance:
-            self.terminal_instance.on_key_press(key, modifiers)
-            return
+        # Printable keys come through on_text instead, already shifted
+        if not keys.typed(key, modifiers):
+            self.model.key_press(key, modifiers)
+
+    def on_text(self, text):
+        self.model.type_text(text)
 
-        if key == arcade.key.ENTER:
-            cmd = self.current_input.strip().lower()
-            self.current_input = ""
-            self.messages.append(f"> {cmd}")
-
-            if cmd in self.data.get("access_commands", []) and self.terminal_instance:
-                self.activate_terminal()
-                return
-
-            if cmd in self.data["exits"]:
-                target_id = self.data["exits"][cmd]
-                target_loc = self.window.locations.get(target_id)
-                if target_loc:
-                    self.window.show_view(target_loc)
-                    target_loc.messages.append("You enter the chamber.")
-                else:
-                    self.messages.append("You can't go that way.")
-                return
-
-            if cmd in ["look", "l"]:
-                self.messages.extend(self.data["description"])
-            elif cmd == "help":
-                cmds = list(self.data["exits"].keys()) + self.data.get("access_commands", [])
-                self.messages.append(f"Commands: {', '.join(cmds)}, look, help")
-            else:
-                self.messages.append("I don't understand that.")
 
-        elif key == arcade.key.BACKSPACE:
-            self.current_input = self.current_input[:-1]
-        elif 32 <= key <= 126:
-            self.current_input += chr(key)
\ No newline at end of file
+class LocationPool:
+    """A few Location views, rebound to whichever room is shown (least recently used first)"""
+
+    def __init__(self, terminals_dict, game_state, texture_cache=None, size=LOCATION_POOL_SIZE):
+        self.terminals_dict = terminals_dict
+        self.game_state = game_state
+        self.texture_cache = texture_cache or TextureCache()
+        self.size = size
+        self.views = []
+
+    def view_for(self, model):
+        view = next((view for view in self.views if view.model is model), None)
+        if view is None:
+            if len(self.views) < self.size:
+                view = Location(self.terminals_dict, self.game_state, self.texture_cache)
+            else:
+                view = self.views.pop(0)
+            view.bind(model)
+        else:
+            self.views.remove(view)
+        self.views.append(view)
+        return view
@@ -1,81 +1,189 @@
 # main.py
+import argparse
+import os
+from collections import deque
 import arcade
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+import keys
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, FRAME_RATE, IDLE_FRAME_RATE, IDLE_DELAY, INPUT_HISTORY_SIZE
 
-from utils import build_terminal
 from terminal.terminal_view import Terminal
+from terminal_registry import TerminalRegistry
 
 # New imports
-from locations import SHIP_LOCATIONS, Location
+from locations import LocationPool
+from location_model import LocationModel
+from ship_data import load_ship
+from ship_index import RoomMap
+from navigation import NavigationGraph
+from jobs import command_executor
 from game_state import GameState
-
-# Your existing terminal specs
-SHIP_TERMINALS = [
-    {
-        "name": "mother",
-        "type": "MOTHER",
-        "integrity": {"cpu": 100, "memory": 70, "storage": 50},
-        "font_name": "Courier New",
-        "font_size": 18,
-    },
-    {
-        "name": "security",
-        "type": "SECURITY",
-        "integrity": {"cpu": 62, "memory": 89, "storage": 100},
-        "font_name": "Courier New",
-        "font_size": 18,
-    },
-    # Add more later
-]
+from replay import InputRecorder, PASTE
+from savegame import Autosaver, read_snapshot, restore
+from profiling import PROFILER
+from profiling_overlay import FrameBudgetOverlay
+from texture_cache import TextureCache
 
 class MyGame(arcade.Window):
-    def __init__(self):
-        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, resizable=False)
+    def __init__(self, seed=None, record_path=None, profile_trace=None, time_scale=1.0, save_path=None):
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, resizable=False, update_rate=FRAME_RATE, draw_rate=FRAME_RATE)
         arcade.set_background_color(arcade.color.BLACK)
 
-        self.game_state = GameState()
-
-        # Build terminals
-        self.terminals = {}
-        for spec in SHIP_TERMINALS:
-            config = build_terminal(spec["integrity"], spec["type"])
-
-            terminal = Terminal(
-                config,
+        # An existing save decides the seed: it rebuilds everything the save leaves out
+        snapshot = None
+        if save_path and os.path.exists(save_path):
+            try:
+                snapshot = read_snapshot(save_path)
+            except ValueError as e:
+                # Moved aside rather than autosaved over, in case it can still be recovered
+                os.replace(save_path, save_path + ".bad")
+                print(f"Save not loaded ({e}); kept as {save_path}.bad, starting a new game")
+        if snapshot:
+            seed = snapshot["seed"]
+        self.game_state = GameState(seed)
+        self.game_state.time_scale = time_scale
+        print(f"Session seed: {self.game_state.seed}")
+
+        # Optional input trace for replaying this session headlessly (replay.py)
+        self.recorder = InputRecorder(record_path, self.game_state.seed, time_scale) if record_path else None
+
+        # Frame profiling: F3 toggles the on-screen budget, --profile-trace streams every frame
+        self.frame_overlay = FrameBudgetOverlay(PROFILER)
+        if profile_trace:
+            PROFILER.start_trace(profile_trace)
+
+        # Drop to IDLE_FRAME_RATE once the active view has been static for IDLE_DELAY
+        self.frame_rate = FRAME_RATE
+        self.idle_time = 0.0
+
+        # Terminals are built when first looked at; see TerminalRegistry
+        def make_terminal(spec, build, rng):
+            return Terminal(
+                build,
                 font_name=spec.get("font_name", "Courier New"),
-                font_size=spec.get("font_size", 18)
+                font_size=spec.get("font_size", 18),
+                rng=rng
             )
-            terminal.name = spec["name"]
-
-            # Proxy to preserve game_view.get_timestamp() compatibility
-            class TimestampProxy:
-                def __init__(self, gs):
-                    self.gs = gs
-                def get_timestamp(self):
-                    return self.gs.get_timestamp()
 
-            terminal.game_view = TimestampProxy(self.game_state)
-
-            self.terminals[spec["name"]] = terminal
-
-        # Create all locations
-        self.locations = {}
-        for loc_data in SHIP_LOCATIONS:
-            loc = Location(loc_data, self.terminals, self.game_state)
-            self.locations[loc_data["id"]] = loc
-
-        # Start in corridor
-        starting = self.locations["corridor"]
-        starting.messages.append("You awaken. Darkness. Pain. Then — flickering light.")
-        self.show_view(starting)
+        self.ship = load_ship()
+        self.navigation = NavigationGraph(self.ship)
+        # Long commands run on worker threads so a scan never holds up a frame
+        self.command_executor = command_executor()
+        self.terminals = TerminalRegistry(self.ship.terminals, self.game_state, make_terminal,
+                                          self.navigation, self.command_executor)
+
+        # Rooms are read from the ship index and their state is built on first visit. A small
+        # pool of views draws them; backgrounds load through one shared cache
+        self.texture_cache = TextureCache()
+        self.room_history = deque(maxlen=INPUT_HISTORY_SIZE)  # One command history for every room
+        self.locations = RoomMap(self.ship, self.make_location)
+        self.location_pool = LocationPool(self.terminals, self.game_state, self.texture_cache)
+
+        self.current = None
+        if snapshot:
+            restore(self, snapshot)
+        else:
+            starting = self.locations[self.ship.start]
+            starting.messages.append("You awaken. Darkness. Pain. Then — flickering light.")
+            self.navigate(starting.data.id)
+
+        self.autosaver = Autosaver(self, save_path) if save_path else None
+        if self.autosaver:
+            self.game_state.subscribe(self.autosaver.update)
+
+    def make_location(self, room):
+        model = LocationModel(room, self.terminals, self.game_state)
+        model.navigate = self.navigate
+        model.navigation = self.navigation
+        model.input.history = self.room_history
+        return model
+
+    def navigate(self, target_id):
+        target = self.locations.get(target_id)
+        if target:
+            self.current = target
+            self.show_view(self.location_pool.view_for(target))
+        return target
 
     def on_update(self, delta_time: float):
-        self.game_state.update_time(delta_time)
+        # The game clock steps every subscribed model; views only draw and forward input
+        if self.recorder:
+            self.recorder.record_tick(delta_time)
+        with PROFILER.phase("simulation"):
+            self.game_state.advance(delta_time)
+        self.frame_overlay.update(delta_time)
+        self.throttle(delta_time)
         super().on_update(delta_time)
 
+    def throttle(self, delta_time):
+        if getattr(self.current_view, "idle", False) and not self.frame_overlay.visible:
+            self.idle_time += delta_time
+        else:
+            self.idle_time = 0.0
+        self.set_frame_rate(IDLE_FRAME_RATE if self.idle_time >= IDLE_DELAY else FRAME_RATE)
+
+    def set_frame_rate(self, rate):
+        if rate != self.frame_rate:
+            self.frame_rate = rate
+            # Update first: the draw rate may not be faster than the update rate
+            self.set_update_rate(rate)
+            self.set_draw_rate(rate)
+
+    def on_draw(self):
+        # Reached after the active view has drawn; closes the profiler frame
+        PROFILER.end_frame()
+        self.frame_overlay.draw()
+
+    def on_key_press(self, key, modifiers):
+        # Reached after the active view's handler
+        # Printable keys are recorded as the text they typed (on_text)
+        if self.recorder and not keys.typed(key, modifiers):
+            self.recorder.record_key(key, modifiers)
+        # Input wakes the loop at once so the echo isn't held back by the idle rate
+        self.idle_time = 0.0
+        self.set_frame_rate(FRAME_RATE)
+        if key == arcade.key.F3:
+            self.frame_overlay.toggle()
+        elif key == arcade.key.PAUSE:
+            self.game_state.toggle_pause()
+        elif key == arcade.key.V and modifiers & arcade.key.MOD_CTRL:
+            self.paste(self.get_clipboard_text())
+
+    def on_text(self, text):
+        # Reached after the active view has typed it
+        if self.recorder:
+            self.recorder.record_text(text)
+
+    def paste(self, text):
+        if not text:
+            return
+        if self.recorder:
+            self.recorder.record_text(text, PASTE)
+        self.current.paste(text)
+
+    def on_close(self):
+        if self.recorder:
+            self.recorder.close()
+        PROFILER.stop_trace()
+        self.texture_cache.shutdown()
+        # Running jobs first: shutdown can't stop a task that has started
+        self.terminals.cancel_jobs()
+        self.command_executor.shutdown(wait=False, cancel_futures=True)
+        if self.autosaver:
+            self.autosaver.shutdown()
+        super().on_close()
+
 
 def main():
-    game = MyGame()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, help="Seed the session RNG for a reproducible run")
+    parser.add_argument("--record", metavar="TRACE", help="Record input events to a trace file")
+    parser.add_argument("--profile-trace", metavar="JSONL", help="Write per-frame timings to a JSONL trace")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Game clock speed (e.g. 10 to fast-forward)")
+    parser.add_argument("--save", metavar="PATH", help="Resume from this save file if it exists, and autosave to it")
+    args = parser.parse_args()
+
+    game = MyGame(seed=args.seed, record_path=args.record, profile_trace=args.profile_trace,
+                  time_scale=args.time_scale, save_path=args.save)
     arcade.run()
 
 
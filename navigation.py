@@ -0,0 +1,161 @@
+# navigation.py
+# Shortest routes over the ship's exits graph. The graph is read from the ship index on the
+# first query: rooms are numbered and each keeps a {neighbour: exit word} map. A route query
+# runs one breadth-first search from its origin and keeps the resulting parent tree (least
+# recently used first), so every later query from that room is a walk up parent links.
+# Locking a door or sealing a section drops the cached trees.
+from array import array
+from collections import OrderedDict
+
+from commands import CommandRegistry
+from constants import ROOM_TRAVEL_TIME, ROUTE_CACHE_SIZE
+
+
+def format_travel_time(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes} min {seconds} s" if minutes else f"{seconds} s"
+
+
+class Route:
+    __slots__ = ("rooms", "exits")
+
+    def __init__(self, rooms, exits):
+        self.rooms = rooms  # Room ids, origin first
+        self.exits = exits  # Exit word taken out of each room but the last
+
+    @property
+    def steps(self):
+        return len(self.exits)
+
+    @property
+    def travel_time(self):
+        return self.steps * ROOM_TRAVEL_TIME
+
+
+class NavigationGraph:
+    def __init__(self, ship, cache_size=ROUTE_CACHE_SIZE):
+        self.ship = ship
+        self.cache_size = cache_size
+        self.locked = set()  # (room id, target id) doors that won't open, both ways
+        self.sealed = set()  # Room ids that can't be entered, e.g. depressurized
+        self.trees = OrderedDict()  # origin number -> parent numbers, oldest first
+        self.ids = None
+
+    def _build(self):
+        if self.ids is not None:
+            return
+        records = list(self.ship.records())
+        self.ids = [record["id"] for record in records]
+        self.numbers = {room_id: i for i, room_id in enumerate(self.ids)}
+        self.names = [record["name"] for record in records]
+        self.neighbours = []
+        self.places = {}  # Lower-case room id or name -> room id
+        self.prefixes = None  # Trie over the same words, built on the first inexact lookup
+        self.terminal_rooms = {}  # terminal name -> room id
+        for record in records:
+            edges = {}
+            for word, target_id in record["exits"].items():
+                target = self.numbers.get(target_id)
+                if target is not None and target not in edges:
+                    edges[target] = word
+            self.neighbours.append(edges)
+            for word in (record["id"], record["name"]):
+                self.places.setdefault(word.lower(), record["id"])
+            if record.get("terminal"):
+                self.terminal_rooms[record["terminal"]] = record["id"]
+
+    def lock(self, room_id, target_id):
+        self.locked.update(((room_id, target_id), (target_id, room_id)))
+        self.trees.clear()
+
+    def unlock(self, room_id, target_id):
+        self.locked.difference_update(((room_id, target_id), (target_id, room_id)))
+        self.trees.clear()
+
+    def seal(self, room_id):
+        self.sealed.add(room_id)
+        self.trees.clear()
+
+    def unseal(self, room_id):
+        self.sealed.discard(room_id)
+        self.trees.clear()
+
+    def snapshot(self):
+        return {"locked": [list(door) for door in self.locked], "sealed": list(self.sealed)}
+
+    def restore(self, state):
+        self.locked = {tuple(door) for door in state["locked"]}
+        self.sealed = set(state["sealed"])
+        self.trees.clear()
+
+    def passable(self, room_id, target_id):
+        return target_id not in self.sealed and (room_id, target_id) not in self.locked
+
+    def find(self, text):
+        """Room id named by text (id or name, or an unambiguous prefix of one), or None"""
+        self._build()
+        text = text.strip().lower()
+        room_id = self.places.get(text)
+        if room_id is None and text:
+            if self.prefixes is None:
+                words = {}
+                for word, place_id in self.places.items():
+                    words.setdefault(place_id, []).append(word)
+                self.prefixes = CommandRegistry()
+                for place_id, aliases in words.items():
+                    self.prefixes.add(place_id, None, aliases=aliases)
+            place = self.prefixes.resolve(text)
+            room_id = place.name if place else None
+        return room_id
+
+    def name(self, room_id):
+        self._build()
+        return self.names[self.numbers[room_id]]
+
+    def terminal_room(self, terminal_name):
+        self._build()
+        return self.terminal_rooms.get(terminal_name)
+
+    def _tree(self, origin):
+        parent = self.trees.get(origin)
+        if parent is not None:
+            self.trees.move_to_end(origin)
+            return parent
+
+        numbers = self.numbers
+        sealed = {numbers[room_id] for room_id in self.sealed if room_id in numbers}
+        locked = {(numbers[a], numbers[b]) for a, b in self.locked if a in numbers and b in numbers}
+        parent = array("i", [-1]) * len(self.ids)
+        parent[origin] = origin
+        frontier = [origin]
+        while frontier:
+            reached = []
+            for room in frontier:
+                for target in self.neighbours[room]:
+                    if parent[target] == -1 and target not in sealed and (room, target) not in locked:
+                        parent[target] = room
+                        reached.append(target)
+            frontier = reached
+
+        self.trees[origin] = parent
+        if len(self.trees) > self.cache_size:
+            self.trees.popitem(last=False)
+        return parent
+
+    def route(self, origin_id, target_id):
+        """Shortest Route between two room ids, or None when there is no way through"""
+        self._build()
+        origin = self.numbers.get(origin_id)
+        target = self.numbers.get(target_id)
+        if origin is None or target is None:
+            return None
+        parent = self._tree(origin)
+        if parent[target] == -1:
+            return None
+
+        path = [target]
+        while path[-1] != origin:
+            path.append(parent[path[-1]])
+        path.reverse()
+        exits = [self.neighbours[room][target] for room, target in zip(path, path[1:])]
+        return Route([self.ids[room] for room in path], exits)
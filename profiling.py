@@ -0,0 +1,81 @@
+# profiling.py
+# In-process frame profiler. Views wrap their work in PROFILER.phase(...) and report draw
+# submissions; MyGame closes each frame. Keeps a rolling window for the on-screen
+# frame-budget overlay and can stream every frame to a JSONL trace.
+import json
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+PHASES = ("simulation", "text_layout", "overlay", "blit")
+
+
+class FrameProfiler:
+    def __init__(self, history=600):
+        self.history = deque(maxlen=history)  # Work time per frame, seconds
+        self.frame = 0
+        self.phases = {}
+        self.draw_calls = 0
+        self.frame_start = None
+        self.alloc_start = 0
+        self.last = None  # Record of the last finished frame
+        self.trace_file = None
+
+    def start_trace(self, path):
+        self.trace_file = open(path, "w")
+
+    def stop_trace(self):
+        if self.trace_file:
+            self.trace_file.close()
+            self.trace_file = None
+
+    def _begin(self):
+        # A frame starts with the first phase timed in it
+        if self.frame_start is None:
+            self.frame_start = time.perf_counter()
+            self.alloc_start = sys.getallocatedblocks()
+
+    @contextmanager
+    def phase(self, name):
+        self._begin()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count_draws(self, count=1):
+        self.draw_calls += count
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        frame_time = time.perf_counter() - self.frame_start
+        self.history.append(frame_time)
+        self.last = {
+            "frame": self.frame,
+            "time": time.time(),
+            "frame_ms": frame_time * 1000,
+            "phases_ms": {name: seconds * 1000 for name, seconds in self.phases.items()},
+            "draw_calls": self.draw_calls,
+            "alloc_blocks": sys.getallocatedblocks() - self.alloc_start,  # Net blocks allocated this frame
+        }
+        if self.trace_file:
+            self.trace_file.write(json.dumps(self.last) + "\n")
+
+        self.frame += 1
+        self.phases = {}
+        self.draw_calls = 0
+        self.frame_start = None
+
+    def percentile(self, pct):
+        """Rolling frame work time percentile, in ms"""
+        if not self.history:
+            return 0.0
+        ordered = sorted(self.history)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index] * 1000
+
+
+PROFILER = FrameProfiler()
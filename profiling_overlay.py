@@ -0,0 +1,48 @@
+# profiling_overlay.py
+import arcade
+from constants import SCREEN_HEIGHT, FONT_NAME_FALLBACK
+from profiling import PHASES
+
+REFRESH_INTERVAL = 0.25  # Seconds between overlay text updates
+
+
+class FrameBudgetOverlay:
+    """Toggleable corner readout of rolling p50/p99 frame time and the last frame's breakdown"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self.timer = REFRESH_INTERVAL
+        self.text = arcade.Text(
+            "", 10, SCREEN_HEIGHT - 10,
+            arcade.color.YELLOW,
+            font_size=11,
+            font_name=FONT_NAME_FALLBACK,
+            anchor_y="top",
+            multiline=True,
+            width=420
+        )
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.timer = REFRESH_INTERVAL
+
+    def update(self, delta_time):
+        if not self.visible:
+            return
+        self.timer += delta_time
+        if self.timer < REFRESH_INTERVAL or not self.profiler.last:
+            return
+        self.timer = 0
+
+        last = self.profiler.last
+        phases = "  ".join(f"{name} {last['phases_ms'].get(name, 0.0):.2f}" for name in PHASES)
+        self.text.value = (
+            f"frame p50 {self.profiler.percentile(50):.2f} ms   p99 {self.profiler.percentile(99):.2f} ms\n"
+            f"{phases}\n"
+            f"draws {last['draw_calls']}   alloc blocks {last['alloc_blocks']:+d}"
+        )
+
+    def draw(self):
+        if self.visible:
+            self.text.draw()
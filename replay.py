@@ -0,0 +1,92 @@
+# replay.py
+# Compact input traces for reproducible benchmarks. A trace is a header holding the session
+# seed and clock time scale, then fixed-size (timestamp, key, modifiers, delta_time) records: key presses carry
+# delta_time 0, frame ticks carry key 0. Typed and pasted text use key 1 and 2, with the
+# byte length in place of the modifiers and the UTF-8 text right after the record.
+# Record from the window (main.py --record), replay headlessly with `python replay.py trace.bin`.
+import struct
+import sys
+import time
+
+MAGIC = b"ASRT"
+VERSION = 4                       # 2: ticks feed the fixed-step game clock, 3: text records, 4: time scale
+HEADER = struct.Struct("<4sHQd")  # magic, version, seed, time scale
+EVENT = struct.Struct("<dIId")    # timestamp, key, modifiers, delta_time
+TICK = 0                          # key value of a frame tick record
+TEXT = 1                          # key value of typed text (on_text)
+PASTE = 2                         # key value of pasted text
+
+
+class InputRecorder:
+    def __init__(self, path, seed, time_scale=1.0):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, time_scale))
+        self.timestamp = 0.0
+
+    def record_tick(self, delta_time):
+        self.timestamp += delta_time
+        self.file.write(EVENT.pack(self.timestamp, TICK, 0, delta_time))
+
+    def record_key(self, key, modifiers):
+        self.file.write(EVENT.pack(self.timestamp, key, modifiers, 0.0))
+
+    def record_text(self, text, kind=TEXT):
+        raw = text.encode("utf-8")
+        self.file.write(EVENT.pack(self.timestamp, kind, len(raw), 0.0))
+        self.file.write(raw)
+
+    def close(self):
+        self.file.close()
+
+
+def load_trace(path):
+    """
+    Return (seed, time_scale, events) where events are (timestamp, key, modifiers, delta_time)
+    tuples; text events hold their text in place of the modifiers
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, seed, time_scale = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} input trace")
+
+    events = []
+    position = HEADER.size
+    while position < len(data):
+        timestamp, key, modifiers, delta_time = EVENT.unpack_from(data, position)
+        position += EVENT.size
+        if key in (TEXT, PASTE):
+            text = data[position:position + modifiers].decode("utf-8")
+            position += modifiers
+            events.append((timestamp, key, text, delta_time))
+        else:
+            events.append((timestamp, key, modifiers, delta_time))
+    return seed, time_scale, events
+
+
+def replay(path, session=None):
+    """Play a trace into a HeadlessSession (a fresh one seeded from the trace by default)"""
+    from headless import HeadlessSession
+
+    seed, time_scale, events = load_trace(path)
+    session = session or HeadlessSession(seed=seed)
+    session.game_state.time_scale = time_scale
+    for timestamp, key, modifiers, delta_time in events:
+        if key == TICK:
+            session.tick(delta_time)
+        elif key == TEXT:
+            session.type_text(modifiers)
+        elif key == PASTE:
+            session.paste(modifiers)
+        else:
+            session.press(key, modifiers)
+    return session
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    session = replay(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    print("\n".join(session.messages))
+    print(f"Replayed in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,222 @@
+# savegame.py
+# Save files: a fixed header, then a zlib-compressed snapshot in a small tagged binary
+# encoding (ints, floats, strings, bytes, lists, dicts; lists of strings are packed as
+# one length table and one blob). The header carries a CRC of the payload, so a torn or
+# foreign file is refused rather than half-loaded.
+#
+#   header (magic, version, payload length, crc32) | zlib(encoded snapshot)
+#
+# A snapshot is plain data gathered by each model's snapshot(): containers are copied
+# and strings shared, so taking one on the main thread is cheap and encoding, compressing
+# and writing can happen on the autosave thread while the game keeps changing.
+import os
+import struct
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import AUTOSAVE_INTERVAL
+
+MAGIC = b"ASSV"
+VERSION = 2  # 2: command histories
+HEADER = struct.Struct("<4sHII")  # magic, version, payload length, payload crc32
+LENGTH = struct.Struct("<I")
+INT = struct.Struct("<q")
+FLOAT = struct.Struct("<d")
+
+
+def encode(value):
+    parts = []
+    _encode(value, parts)
+    return b"".join(parts)
+
+
+def _encode(value, parts):
+    if value is None:
+        parts.append(b"N")
+    elif value is True:
+        parts.append(b"T")
+    elif value is False:
+        parts.append(b"F")
+    elif isinstance(value, int):
+        if -2 ** 63 <= value < 2 ** 63:
+            parts += (b"i", INT.pack(value))
+        else:  # e.g. numpy bit generator state
+            raw = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+            parts += (b"I", LENGTH.pack(len(raw)), raw)
+    elif isinstance(value, float):
+        parts += (b"f", FLOAT.pack(value))
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        parts += (b"s", LENGTH.pack(len(raw)), raw)
+    elif isinstance(value, (bytes, bytearray)):
+        parts += (b"b", LENGTH.pack(len(value)), bytes(value))
+    elif isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, str) for item in value):
+            raw = [item.encode("utf-8") for item in value]
+            lengths = array("I", map(len, raw))
+            parts += (b"S", LENGTH.pack(len(raw)), lengths.tobytes(), b"".join(raw))
+        else:
+            parts += (b"l", LENGTH.pack(len(value)))
+            for item in value:
+                _encode(item, parts)
+    elif isinstance(value, dict):
+        parts += (b"d", LENGTH.pack(len(value)))
+        for key, item in value.items():
+            _encode(key, parts)
+            _encode(item, parts)
+    else:
+        raise TypeError(f"can't save {type(value).__name__}")
+
+
+def decode(data):
+    value, _ = _decode(memoryview(data), 0)
+    return value
+
+
+def _decode(data, position):
+    tag = data[position:position + 1].tobytes()
+    position += 1
+    if tag == b"N":
+        return None, position
+    if tag == b"T":
+        return True, position
+    if tag == b"F":
+        return False, position
+    if tag == b"i":
+        return INT.unpack_from(data, position)[0], position + INT.size
+    if tag == b"f":
+        return FLOAT.unpack_from(data, position)[0], position + FLOAT.size
+
+    (length,) = LENGTH.unpack_from(data, position)
+    position += LENGTH.size
+    if tag == b"I":
+        return int.from_bytes(data[position:position + length], "little", signed=True), position + length
+    if tag == b"s":
+        return str(data[position:position + length], "utf-8"), position + length
+    if tag == b"b":
+        return data[position:position + length].tobytes(), position + length
+    if tag == b"S":
+        lengths = array("I")
+        lengths.frombytes(data[position:position + length * lengths.itemsize])
+        position += length * lengths.itemsize
+        items = []
+        for size in lengths:
+            items.append(str(data[position:position + size], "utf-8"))
+            position += size
+        return items, position
+    if tag == b"l":
+        items = []
+        for _ in range(length):
+            item, position = _decode(data, position)
+            items.append(item)
+        return items, position
+    if tag == b"d":
+        items = {}
+        for _ in range(length):
+            key, position = _decode(data, position)
+            items[key], position = _decode(data, position)
+        return items, position
+    raise ValueError(f"corrupt save data (tag {tag!r})")
+
+
+def capture(session):
+    """Snapshot of a session (MyGame or HeadlessSession); main thread, cheap"""
+    return {
+        "seed": session.game_state.seed,
+        "game": session.game_state.snapshot(),
+        "terminals": session.terminals.snapshot(),
+        "rooms": {room_id: room.snapshot() for room_id, room in session.locations.built.items()},
+        "navigation": session.navigation.snapshot(),
+        "room_history": list(session.room_history),
+        "current": session.current.data.id,
+    }
+
+
+def restore(session, snapshot):
+    """Load a snapshot into a fresh session built with the snapshot's seed"""
+    session.game_state.restore(snapshot["game"])
+    session.navigation.restore(snapshot["navigation"])
+    session.room_history.extend(snapshot["room_history"])
+    session.terminals.restore(snapshot["terminals"])
+    for room_id, state in snapshot["rooms"].items():
+        session.locations[room_id].restore(state)
+    session.navigate(snapshot["current"])
+
+
+def write_snapshot(path, snapshot):
+    payload = zlib.compress(encode(snapshot))
+    # Written aside and renamed, so a crash mid-save leaves the previous save intact
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(payload), zlib.crc32(payload)))
+        f.write(payload)
+    os.replace(temp_path, path)
+
+
+def _upgrade_v1(snapshot):
+    # Version 2 added the command histories; an old save starts them empty
+    snapshot["room_history"] = []
+    for state in snapshot["terminals"]["built"].values():
+        state["input_history"] = []
+
+
+UPGRADES = {1: _upgrade_v1}  # version -> function bringing its snapshot to the next version
+
+
+def read_snapshot(path):
+    """A save's snapshot, upgraded to the current version; ValueError if it can't be read"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is damaged")
+    magic, version, length, crc = HEADER.unpack_from(data)
+    payload = data[HEADER.size:HEADER.size + length]
+    if magic != MAGIC or not (version == VERSION or version in UPGRADES):
+        raise ValueError(f"{path} is not a version {VERSION} save")
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError(f"{path} is damaged")
+    snapshot = decode(zlib.decompress(payload))
+    while version < VERSION:
+        UPGRADES[version](snapshot)
+        version += 1
+    return snapshot
+
+
+def save_game(session, path):
+    write_snapshot(path, capture(session))
+
+
+def load_game(session, path):
+    restore(session, read_snapshot(path))
+
+
+class Autosaver:
+    """
+    Saves the session every AUTOSAVE_INTERVAL of game time. Only capture() runs on the
+    game clock; encoding and writing happen on a worker thread. A save still in flight
+    when the next one is due makes that one wait a step rather than queue up.
+    """
+
+    def __init__(self, session, path, interval=AUTOSAVE_INTERVAL):
+        self.session = session
+        self.path = path
+        self.interval = interval
+        self.timer = 0.0
+        self.pending = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+
+    def update(self, delta_time):
+        self.timer += delta_time
+        if self.timer >= self.interval and (self.pending is None or self.pending.done()):
+            self.timer = 0.0
+            self.save()
+
+    def save(self):
+        self.pending = self.executor.submit(write_snapshot, self.path, capture(self.session))
+        return self.pending
+
+    def shutdown(self):
+        """Write a last save and wait for it"""
+        self.save().result()
+        self.executor.shutdown()
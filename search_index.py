@@ -0,0 +1,174 @@
+# search_index.py
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from itertools import islice, takewhile
+
+WORD = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """
+    Inverted index over numbered lines of text, built as lines arrive: each word keeps an
+    ascending array of the lines it appears in. A search walks the postings of its
+    rarest word in line order and checks each line for the exact text, stopping once it
+    has enough hits, so cost follows the hits rather than the length of the history.
+
+    Words at the ends of a query may be parts of longer words ("pari" finds "parity");
+    those are looked up in the vocabulary, kept packed in newline-separated strings so
+    the scan runs in str.find.
+
+    With max_lines, the oldest lines are dropped as new ones arrive. Each dropped line's
+    words shed their stale postings once those make up half the array, so the cost of
+    clearing them out is spread over the adds instead of landing on one of them.
+    """
+
+    def __init__(self, max_lines=None):
+        self.max_lines = max_lines
+        self.texts = []  # Line texts from number `base` on; dropped ones are None
+        self.base = 0
+        self.first = 0  # Oldest line still kept
+        self.postings = {}  # word -> array of line numbers
+        self.vocabulary = []  # "word\nword\n..." chunks holding every word in postings
+        self.new_words = []
+        self.dead_words = 0  # Words in the vocabulary whose lines have all been dropped
+
+    def __len__(self):
+        return self.base + len(self.texts) - self.first
+
+    @property
+    def end(self):
+        return self.base + len(self.texts)
+
+    def add(self, text):
+        number = self.end
+        self.texts.append(text)
+        self._post(number, text)
+        if self.max_lines and len(self) > self.max_lines:
+            self._drop_oldest()
+        return number
+
+    def _drop_oldest(self):
+        text = self.texts[self.first - self.base]
+        self.texts[self.first - self.base] = None
+        self.first += 1
+        for word in set(WORD.findall(text.lower())):
+            postings = self.postings[word]
+            stale = bisect_left(postings, self.first)
+            if stale == len(postings):
+                del self.postings[word]
+                self.dead_words += 1
+            elif stale * 2 >= len(postings):
+                del postings[:stale]
+        if self.first - self.base >= self.max_lines:
+            del self.texts[:self.first - self.base]
+            self.base = self.first
+
+    def _post(self, number, text):
+        for word in set(WORD.findall(text.lower())):
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = array("q")
+                self.new_words.append(word)
+            postings.append(number)
+
+    def _rebuild(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.new_words = []
+        self.dead_words = 0
+        for offset, text in enumerate(self.texts):
+            self._post(self.base + offset, text)
+
+    def snapshot(self):
+        """The kept lines; postings are rebuilt from them on restore"""
+        return {"first": self.first, "texts": self.texts[self.first - self.base:]}
+
+    def restore(self, state):
+        self.texts = list(state["texts"])
+        self.base = self.first = state["first"]
+        self._rebuild()
+
+    def text(self, number):
+        return self.texts[number - self.base]
+
+    def _words_containing(self, term):
+        if self.dead_words > len(self.postings):
+            # Mostly dropped words: pack the live ones afresh
+            self.vocabulary = ["".join(word + "\n" for word in self.postings)]
+            self.new_words = []
+            self.dead_words = 0
+        if self.new_words:
+            self.vocabulary.append("\n".join(self.new_words) + "\n")
+            self.new_words = []
+            if len(self.vocabulary) > 32:
+                self.vocabulary = ["".join(self.vocabulary)]
+        words = []
+        for chunk in self.vocabulary:
+            position = chunk.find(term)
+            while position != -1:
+                end = chunk.find("\n", position)
+                words.append(chunk[chunk.rfind("\n", 0, position) + 1:end])
+                position = chunk.find(term, end)
+        # A dropped word that came back is packed twice
+        return [word for word in dict.fromkeys(words) if word in self.postings]
+
+    def _candidates(self, needle, newest_first=False):
+        """Line numbers that may contain needle, in order, from the rarest of its words"""
+        best = None
+        for match in WORD.finditer(needle):
+            term = match.group()
+            # Bounded by other characters on both sides, a word must appear whole
+            if match.start() > 0 and match.end() < len(needle):
+                postings = self.postings.get(term)
+                lists = [postings] if postings is not None else []
+            else:
+                lists = [self.postings[word] for word in self._words_containing(term)]
+            size = sum(map(len, lists))
+            if best is None or size < best[0]:
+                best = (size, lists)
+        if best is None:  # No words at all: plain scan
+            return range(self.end - 1, self.first - 1, -1) if newest_first else range(self.first, self.end)
+        lists = best[1]
+        if newest_first:
+            lists = [reversed(postings) for postings in lists]
+        if len(lists) == 1:
+            return lists[0]
+        return _unique(heapq.merge(*lists, reverse=newest_first))
+
+    def search(self, query, limit=None, newest_first=False):
+        """Numbers of kept lines containing query (case-insensitive), oldest first unless newest_first"""
+        needle = query.lower()
+        if not needle:
+            return []
+        first = self.first
+        candidates = self._candidates(needle, newest_first)
+        if newest_first:  # Dropped lines come last: stop at the first one
+            candidates = takewhile(lambda n: n >= first, candidates)
+        hits = (n for n in candidates if n >= first and needle in self.text(n).lower())
+        return list(islice(hits, limit))
+
+
+def _unique(numbers):
+    last = None
+    for number in numbers:
+        if number != last:
+            yield number
+            last = number
+
+
+def highlight(text, query, start="«", end="»"):
+    """Mark every case-insensitive occurrence of query in text"""
+    if not query:
+        return text
+    lower, needle = text.lower(), query.lower()
+    parts = []
+    position = 0
+    found = lower.find(needle)
+    while found != -1:
+        parts += [text[position:found], start, text[found:found + len(needle)], end]
+        position = found + len(needle)
+        found = lower.find(needle, position)
+    parts.append(text[position:])
+    return "".join(parts)
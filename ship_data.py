@@ -0,0 +1,12 @@
+# ship_data.py
+# Rooms and terminals of the ship. The map is authored in resources/ships/ (JSON or TOML) and
+# read through a compiled index (ship_index.py), shared by the arcade views and headless.py
+import os
+from ship_index import open_ship
+
+DEFAULT_SHIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "ships", "default.json")
+
+
+def load_ship(path=DEFAULT_SHIP):
+    """Open a ship definition, (re)compiling its index if the source changed"""
+    return open_ship(path)
@@ -0,0 +1,211 @@
+# ship_index.py
+# Ships are authored as JSON or TOML ({"start", "terminals", "locations"}) and compiled into
+# a binary index next to the source. Opening the index reads a fixed header and the small
+# metadata block (start room, terminal specs); rooms are found by binary search over a
+# sorted hash table and decoded one at a time, so startup cost doesn't grow with the map.
+#
+#   header | metadata JSON | table of (id hash, offset, length), sorted | room records (JSON)
+#
+# The header stores the source file's mtime and size; a stale index is rebuilt on open.
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+
+MAGIC = b"ASHX"
+VERSION = 1
+HEADER = struct.Struct("<4sHqqII")  # magic, version, source mtime_ns, source size, room count, metadata length
+ENTRY = struct.Struct("<QII")       # room id hash, record offset, record length
+
+
+def room_hash(room_id):
+    return int.from_bytes(hashlib.blake2b(room_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def read_source(path):
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Room:
+    """Static definition of one room, as decoded from the index"""
+    __slots__ = ("id", "name", "description", "background", "exits", "terminal", "access_commands")
+
+    def __init__(self, record, base=None):
+        self.id = record["id"]
+        self.name = record["name"]
+        self.description = record["description"]
+        self.background = record.get("background")
+        if self.background and base:
+            self.background = os.path.normpath(os.path.join(base, self.background))
+        self.exits = record["exits"]
+        self.terminal = record.get("terminal")
+        self.access_commands = record.get("access_commands", [])
+
+
+def compile_index(source_path, index_path):
+    """Compile a ship definition file into a binary index"""
+    ship = read_source(source_path)
+    stat = os.stat(source_path)
+
+    meta = json.dumps({"start": ship["start"], "terminals": ship.get("terminals", [])}).encode("utf-8")
+    records = [(room_hash(room["id"]), json.dumps(room, ensure_ascii=False).encode("utf-8"))
+               for room in ship["locations"]]
+    records.sort(key=lambda record: record[0])
+
+    offset = HEADER.size + len(meta) + ENTRY.size * len(records)
+    table = bytearray()
+    for key, blob in records:
+        table += ENTRY.pack(key, offset, len(blob))
+        offset += len(blob)
+
+    # Written aside and renamed, so a reader never maps a half-written index
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size, len(records), len(meta)))
+        f.write(meta)
+        f.write(table)
+        for _, blob in records:
+            f.write(blob)
+    os.replace(temp_path, index_path)
+
+
+class ShipIndex:
+    """Read-only view of a compiled ship. Rooms are decoded on first lookup and kept"""
+
+    def __init__(self, index_path):
+        with open(index_path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.source_mtime, self.source_size, self.room_count, meta_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{index_path} is not a version {VERSION} ship index")
+
+        meta = json.loads(self.data[HEADER.size:HEADER.size + meta_length])
+        self.start = meta["start"]
+        self.terminals = meta["terminals"]
+        self.table_offset = HEADER.size + meta_length
+        self.rooms = {}  # room id -> Room
+        self.base = None  # Directory relative paths in the ship resolve against (open_ship sets it)
+
+    def close(self):
+        self.data.close()
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self.data, self.table_offset + i * ENTRY.size)
+
+    def _load(self, offset, length):
+        return json.loads(self.data[offset:offset + length])
+
+    def room(self, room_id):
+        """Room by id, or None"""
+        room = self.rooms.get(room_id)
+        if room is not None:
+            return room
+
+        key = room_hash(room_id)
+        low, high = 0, self.room_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._entry(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        # Equal hashes sit next to each other; the record's own id settles collisions
+        while low < self.room_count:
+            entry_key, offset, length = self._entry(low)
+            if entry_key != key:
+                break
+            record = self._load(offset, length)
+            if record["id"] == room_id:
+                room = self.rooms[room_id] = Room(record, self.base)
+                return room
+            low += 1
+        return None
+
+    def __contains__(self, room_id):
+        return self.room(room_id) is not None
+
+    def __len__(self):
+        return self.room_count
+
+    def records(self):
+        """Every raw room record; decodes the whole map, so keep it for tools rather than startup"""
+        for i in range(self.room_count):
+            _, offset, length = self._entry(i)
+            yield self._load(offset, length)
+
+    def room_ids(self):
+        for record in self.records():
+            yield record["id"]
+
+
+def open_ship(source_path, index_path=None):
+    """
+    Open a ship's index, compiling it first when missing or older than the source.
+    Terminal filesystem roots and room backgrounds are relative to the source file, so any
+    cwd works
+    """
+    index = _open_index(source_path, index_path)
+    base = index.base = os.path.dirname(os.path.abspath(source_path))
+    for spec in index.terminals:
+        if spec.get("filesystem"):
+            spec["filesystem"] = os.path.normpath(os.path.join(base, spec["filesystem"]))
+    return index
+
+
+def _open_index(source_path, index_path):
+    index_path = index_path or os.path.splitext(source_path)[0] + ".shipidx"
+    stat = os.stat(source_path)
+    try:
+        index = ShipIndex(index_path)
+        if (index.source_mtime, index.source_size) == (stat.st_mtime_ns, stat.st_size):
+            return index
+        index.close()
+    except (OSError, ValueError, struct.error):
+        pass
+    compile_index(source_path, index_path)
+    return ShipIndex(index_path)
+
+
+class RoomMap(Mapping):
+    """Rooms by id from a ShipIndex, each built by factory(room) on first access"""
+
+    def __init__(self, ship, factory):
+        self.ship = ship
+        self.factory = factory
+        self.built = {}
+
+    def __getitem__(self, room_id):
+        room = self.built.get(room_id)
+        if room is None:
+            definition = self.ship.room(room_id)
+            if definition is None:
+                raise KeyError(room_id)
+            room = self.factory(definition)
+            self.built[room_id] = room
+        return room
+
+    def __contains__(self, room_id):
+        return room_id in self.built or room_id in self.ship
+
+    def __iter__(self):
+        return self.ship.room_ids()
+
+    def __len__(self):
+        return len(self.ship)
+
+
+if __name__ == "__main__":
+    # python ship_index.py ship.json [ship.shipidx]
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".shipidx"
+    compile_index(source, target)
+    print(f"Compiled {source} -> {target}")
@@ -0,0 +1,164 @@
+# ship_systems.py
+import numpy as np
+from constants import (
+    SYSTEM_DECAY_RATE, SYSTEM_DECAY_SPREAD, SYSTEM_FAULT_CHANCE, SYSTEM_FAULT_DAMAGE,
+    SYSTEM_CASCADE_FACTOR, SYSTEM_CRITICAL, SYSTEM_DEGRADED, SYSTEM_TICK
+)
+
+COMPONENTS = ("cpu", "memory", "storage")
+WEIGHTS = np.array([0.45, 0.35, 0.20])  # Same weighting as utils.system_checks
+CRITICAL_PENALTY = 1.8
+DIAGNOSTIC_CHUNK = 256  # Terminals scanned between progress reports
+
+
+def degradation(integrity):
+    """Vectorized utils.system_checks over a (terminals, components) integrity array"""
+    base = ((100 - integrity) * WEIGHTS).sum(axis=1)
+    penalty = (np.clip(SYSTEM_CRITICAL - integrity, 0, None) * CRITICAL_PENALTY).sum(axis=1)
+    return np.maximum(0, np.rint(base + penalty)).astype(int)
+
+
+def diagnostic_report(names, shown):
+    """
+    Job output (jobs.py) for a full systems scan over a copy of ShipSystems.shown:
+    a line per degraded component, progress after every chunk of terminals.
+    """
+    yield f"Scanning {len(names)} terminals..."
+    degraded = failed = 0
+    for start in range(0, len(names), DIAGNOSTIC_CHUNK):
+        block = shown[start:start + DIAGNOSTIC_CHUNK]
+        for row, column in zip(*np.nonzero(block < SYSTEM_DEGRADED)):
+            value = int(block[row, column])
+            if value < SYSTEM_CRITICAL:
+                failed += 1
+                status = "FAILED"
+            else:
+                degraded += 1
+                status = "DEGRADED"
+            yield f"  {names[start + row]:<12} {COMPONENTS[column]:<8} {value:>3}%  {status}"
+        yield min(1.0, (start + DIAGNOSTIC_CHUNK) / len(names))
+    yield f"Scan complete: {degraded} degraded, {failed} failed."
+
+
+class ShipSystems:
+    """
+    Live integrity of every terminal's subsystems, one row per terminal. Every SYSTEM_TICK
+    of game time applies decay, random faults, repairs and cascades as whole-array
+    operations, so cost grows with array size rather than with a Python loop per component.
+
+    Attached terminal models get their integrity and system_degradation refreshed when
+    their row changes, which moves their jitter and glitch rates over time.
+    """
+
+    def __init__(self, specs, seed):
+        self.names = [spec["name"] for spec in specs]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        rows = [[spec["integrity"][c] for c in COMPONENTS] for spec in specs]
+        self.integrity = np.array(rows, dtype=float).reshape(-1, len(COMPONENTS))
+
+        self.rng = np.random.default_rng(seed)
+        # Each component wears at its own pace
+        spread = self.rng.uniform(1 - SYSTEM_DECAY_SPREAD, 1 + SYSTEM_DECAY_SPREAD, self.integrity.shape)
+        self.decay_rate = SYSTEM_DECAY_RATE * spread
+        self.repair_rate = np.zeros_like(self.integrity)
+        self.repair_time = np.zeros_like(self.integrity)
+
+        self.critical = self.integrity < SYSTEM_CRITICAL
+        self.wear = self._wear()
+        self.degradation = degradation(self.integrity)
+        self.shown = np.round(self.integrity).astype(int)  # Whole percentages as terminals display them
+
+        self.timer = 0.0
+        self.models = {}  # row -> attached TerminalModel
+        self.attached = np.zeros(len(self.names), dtype=bool)
+        self.on_failure = None  # Called with (terminal name, component) when one drops below critical
+
+    def attach(self, name, model):
+        row = self.index[name]
+        self.models[row] = model
+        self.attached[row] = True
+        self._feed(row)
+
+    def integrity_of(self, name):
+        return dict(zip(COMPONENTS, self.shown[self.index[name]].tolist()))
+
+    def repair(self, name, component=None, amount=25.0, duration=10.0):
+        """Restore `amount` integrity over `duration` seconds (every component by default)"""
+        row = self.index[name]
+        columns = slice(None) if component is None else COMPONENTS.index(component)
+        self.repair_rate[row, columns] = amount / duration
+        self.repair_time[row, columns] = duration
+
+    def snapshot(self):
+        # decay_rate comes from the seed; critical, shown and degradation follow from integrity
+        return {"integrity": self.integrity.tobytes(), "repair_rate": self.repair_rate.tobytes(),
+                "repair_time": self.repair_time.tobytes(), "timer": self.timer,
+                "rng": self.rng.bit_generator.state}
+
+    def restore(self, state):
+        shape = self.integrity.shape
+        self.integrity = np.frombuffer(state["integrity"]).reshape(shape).copy()
+        self.repair_rate = np.frombuffer(state["repair_rate"]).reshape(shape).copy()
+        self.repair_time = np.frombuffer(state["repair_time"]).reshape(shape).copy()
+        self.timer = state["timer"]
+        self.rng.bit_generator.state = state["rng"]
+        self.critical = self.integrity < SYSTEM_CRITICAL
+        self.wear = self._wear()
+        self.shown = np.round(self.integrity).astype(int)
+        self.degradation = degradation(self.shown)
+        for row in self.models:
+            self._feed(row)
+
+    def update(self, delta_time):
+        # Wear is slow, so the arrays are stepped at SYSTEM_TICK rather than every clock step
+        self.timer += delta_time
+        if self.timer >= SYSTEM_TICK:
+            self.tick(self.timer)
+            self.timer = 0.0
+
+    def _wear(self):
+        # Cascade: every failed component speeds up the wear of its siblings
+        failed_siblings = self.critical.sum(axis=1, keepdims=True) - self.critical
+        return self.decay_rate * (1 + SYSTEM_CASCADE_FACTOR * failed_siblings)
+
+    def tick(self, delta_time):
+        integrity = self.integrity
+
+        # Faults are rare: draw how many happen, then where, instead of a roll per component
+        fault_count = self.rng.binomial(integrity.size, min(1.0, SYSTEM_FAULT_CHANCE * delta_time))
+        loss = self.wear * delta_time
+        if fault_count:
+            faults = np.zeros(integrity.size)
+            faults[self.rng.integers(0, integrity.size, fault_count)] = SYSTEM_FAULT_DAMAGE
+            loss += faults.reshape(integrity.shape)
+        integrity -= loss
+
+        # Faults, repairs and failures are rare, so their array passes are skipped when idle
+        if self.repair_time.any():
+            repairing = self.repair_time > 0
+            integrity += self.repair_rate * np.minimum(self.repair_time, delta_time) * repairing
+            self.repair_time[repairing] -= delta_time
+        np.clip(integrity, 0, 100, out=integrity)
+
+        critical = integrity < SYSTEM_CRITICAL
+        if (critical != self.critical).any():
+            new_failures = critical & ~self.critical
+            self.critical = critical
+            self.wear = self._wear()
+            if self.on_failure and new_failures.any():
+                for row, column in zip(*np.nonzero(new_failures)):
+                    self.on_failure(self.names[row], COMPONENTS[column])
+
+        # Only attached terminals whose displayed numbers moved are touched
+        shown = np.round(integrity).astype(int)
+        changed = (shown != self.shown).any(axis=1)
+        if changed.any():
+            self.shown = shown
+            self.degradation = degradation(shown)
+            for row in np.flatnonzero(changed & self.attached):
+                self._feed(row)
+
+    def _feed(self, row):
+        model = self.models[row]
+        model.cpu_integrity, model.memory_integrity, model.storage_integrity = self.shown[row].tolist()
+        model.system_degradation = int(self.degradation[row])
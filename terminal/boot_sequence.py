@@ -1,11 +1,11 @@
+import random
 from constants import FAST, INSTANT, SLOW
-from random import choice
 
-def universal_boot_sequence(terminal_integrity, terminal_type):
+def universal_boot_sequence(terminal_integrity, terminal_type, rng=random):
 
     if terminal_type == "MOTHER":
-        num1 = choice(range(206, 219))
-        num2 = choice(range(63, 89))
+        num1 = rng.choice(range(206, 219))
+        num2 = rng.choice(range(63, 89))
         terminal = terminal_type + f" MOT-{num1}.{num2}"
     else:
         # add more logic for unique terminal names
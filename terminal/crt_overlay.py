@@ -0,0 +1,63 @@
+import arcade
+import constants
+
+
+def _line_quad(start_x, start_y, end_x, end_y, line_width):
+    """Two triangles covering a straight (horizontal or vertical) line of the given width"""
+    half = line_width / 2
+    if start_y == end_y:
+        left, right, bottom, top = start_x, end_x, start_y - half, start_y + half
+    else:
+        left, right, bottom, top = start_x - half, start_x + half, start_y, end_y
+    return [
+        (left, bottom), (right, bottom), (right, top),
+        (left, bottom), (right, top), (left, top),
+    ]
+
+
+class CRTOverlay:
+    """
+    Screen border + scanlines baked into a single shape so the overlay costs one
+    draw call per frame. Rebuilt only when the window size or the SCANLINE_* /
+    BORDER_* constants change.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.shape_list = None
+
+    def current_key(self, width, height):
+        # Read through the module so runtime changes to the constants are picked up
+        return (
+            width, height,
+            constants.SCANLINE_STEP, constants.SCANLINE_WIDTH, tuple(constants.SCANLINE_COLOR),
+            constants.BORDER_WIDTH, tuple(constants.BORDER_COLOR),
+        )
+
+    def build(self, width, height):
+        points = []
+        colors = []
+
+        # Border
+        for line in (
+            (0, height, width, height),
+            (0, 0, width, 0),
+            (0, 0, 0, height),
+            (width, 0, width, height),
+        ):
+            points += _line_quad(*line, constants.BORDER_WIDTH)
+            colors += [constants.BORDER_COLOR] * 6
+
+        # Scanlines
+        for y in range(0, height, constants.SCANLINE_STEP):
+            points += _line_quad(0, y, width, y, constants.SCANLINE_WIDTH)
+            colors += [constants.SCANLINE_COLOR] * 6
+
+        self.shape_list = arcade.shape_list.ShapeElementList()
+        self.shape_list.append(arcade.shape_list.create_triangles_filled_with_colors(points, colors))
+        self.key = self.current_key(width, height)
+
+    def draw(self, width, height):
+        if self.current_key(width, height) != self.key:
+            self.build(width, height)
+        self.shape_list.draw()
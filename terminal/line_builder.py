@@ -0,0 +1,30 @@
+class LineBuilder:
+    """
+    A terminal line that grows one character at a time. Appending is O(1);
+    the joined string is built lazily and cached until the next append.
+    """
+
+    __slots__ = ("chars", "_text")
+
+    def __init__(self, text=""):
+        self.chars = list(text)
+        self._text = text
+
+    def append(self, char):
+        self.chars.append(char)
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self.chars)
+        return self._text
+
+    def __len__(self):
+        return len(self.chars)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"LineBuilder({self.text!r})"
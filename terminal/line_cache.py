@@ -0,0 +1,67 @@
+import arcade
+from pyglet.graphics import Batch
+
+
+class LineCache:
+    """
+    Keeps one arcade.Text per visible terminal line so glyph layout is only
+    redone when a line actually changes. Everything is drawn in one batch.
+    """
+
+    def __init__(self, font_name, font_size, color, cursor_color):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.color = color
+        self.batch = Batch()
+        self.lines = {}  # line index -> arcade.Text
+
+        # Cursor lives in the same batch, it only ever moves or hides
+        self.cursor = arcade.Text(
+            "█", 0, 0,
+            cursor_color,
+            font_size=font_size,
+            font_name=font_name,
+            batch=self.batch
+        )
+        self.cursor.visible = False
+
+    def update_line(self, index, text, x, y, anchor_y):
+        """Sync the cached Text for a line, only touching what changed"""
+        line = self.lines.get(index)
+        if line is None:
+            line = arcade.Text(
+                text,
+                x, y,
+                self.color,
+                font_size=self.font_size,
+                font_name=self.font_name,
+                anchor_y=anchor_y,
+                batch=self.batch
+            )
+            self.lines[index] = line
+            return line
+
+        # arcade.Text skips the relayout when value / position are unchanged
+        line.value = text
+        line.x = x
+        line.y = y
+        if line.anchor_y != anchor_y:
+            line.anchor_y = anchor_y
+        return line
+
+    def prune(self, start, end):
+        """Drop cached lines outside [start, end) — e.g. scrolled off or cleared"""
+        for index in [i for i in self.lines if not start <= i < end]:
+            self.lines.pop(index).batch = None
+
+    def place_cursor(self, x, y, anchor_y, visible):
+        self.cursor.visible = visible
+        if not visible:
+            return
+        self.cursor.x = x
+        self.cursor.y = y
+        if self.cursor.anchor_y != anchor_y:
+            self.cursor.anchor_y = anchor_y
+
+    def draw(self):
+        self.batch.draw()
@@ -0,0 +1,50 @@
+import posixpath
+
+
+class Pager:
+    """
+    less for the terminal: keeps a window into a LogFile and hands back the lines to print
+    for each move. The terminal prints every screen below the last one, so the screen
+    always ends with the page and a status line; only the page being looked at is read.
+    """
+
+    def __init__(self, log, path, height):
+        self.log = log
+        self.name = posixpath.basename(path)
+        self.height = max(1, height)  # Text lines per page, the status line comes on top
+        self.top = 0
+
+    def page(self, top=None):
+        """Lines of the page starting at `top` (the current one by default)"""
+        if top is not None:
+            self.top = max(0, top)
+        return self.log.lines(self.top, self.height)
+
+    def next_line(self):
+        """The line scrolled in by moving down one, or None at the end"""
+        line = self.log.lines(self.top + self.height, 1)
+        if not line:
+            return None
+        self.top += 1
+        return line[0]
+
+    def next_page(self):
+        if not self.log.lines(self.top + self.height, 1):
+            return None
+        return self.page(self.top + self.height)
+
+    def previous_page(self):
+        return self.page(self.top - self.height)
+
+    @property
+    def at_end(self):
+        return not self.log.lines(self.top + self.height, 1)
+
+    def status(self):
+        if self.at_end:
+            return "(END)"
+        bottom = self.log.offset_of(self.top + self.height)
+        return f"{self.name} {bottom * 100 // max(1, self.log.size)}%  (space, enter, b, q)"
+
+    def close(self):
+        self.log.close()
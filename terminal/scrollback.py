@@ -0,0 +1,82 @@
+from collections import deque
+from constants import SCROLLBACK_MAX_LINES, SCROLLBACK_MAX_BYTES
+from terminal.line_builder import LineBuilder
+
+
+def _byte_size(text):
+    return len(text.encode("utf-8"))
+
+
+class Scrollback:
+    """
+    Bounded store for terminal output lines. Behaves like the list it replaces
+    (len, indexing returns str) but drops the oldest lines once either the line
+    or the byte limit is exceeded. Lines are LineBuilders, so the typewriter
+    grows the newest one in place with append_char.
+
+    `start` is the absolute number of the oldest kept line, so callers that need
+    stable line ids (e.g. the draw cache) can use start + index.
+
+    on_commit, if set, is called with each line's final text once a newer line follows
+    it (or it is cleared away), e.g. to feed a SearchIndex.
+    """
+
+    def __init__(self, lines=("",), max_lines=SCROLLBACK_MAX_LINES, max_bytes=SCROLLBACK_MAX_BYTES):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.lines = deque()
+        self.byte_size = 0
+        self.start = 0
+        self.on_commit = None
+        for line in lines:
+            self.append(line)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return (line.text for line in self.lines)
+
+    def __getitem__(self, index):
+        return self.lines[index].text
+
+    def __setitem__(self, index, text):
+        self.byte_size += _byte_size(text) - _byte_size(self.lines[index].text)
+        self.lines[index] = LineBuilder(text)
+        self._trim()
+
+    def append(self, text=""):
+        if self.on_commit and self.lines:
+            self.on_commit(self.lines[-1].text)
+        self.lines.append(LineBuilder(text))
+        self.byte_size += _byte_size(text)
+        self._trim()
+
+    def append_char(self, char):
+        """Grow the newest line by one character, O(1)"""
+        self.lines[-1].append(char)
+        self.byte_size += _byte_size(char)
+        self._trim()
+
+    def clear(self):
+        # Cleared lines count as dropped so absolute line numbers never repeat
+        if self.on_commit and self.lines:
+            self.on_commit(self.lines[-1].text)
+        self.start += len(self.lines)
+        self.lines.clear()
+        self.byte_size = 0
+
+    def snapshot(self):
+        return {"lines": list(self), "start": self.start}
+
+    def restore(self, state):
+        """Replace the contents without committing anything"""
+        self.lines = deque(LineBuilder(text) for text in state["lines"])
+        self.byte_size = sum(map(_byte_size, state["lines"]))
+        self.start = state["start"]
+
+    def _trim(self):
+        # Always keep the newest line, it is the one being written to
+        while len(self.lines) > 1 and (len(self.lines) > self.max_lines or self.byte_size > self.max_bytes):
+            self.byte_size -= _byte_size(self.lines.popleft().text)
+            self.start += 1
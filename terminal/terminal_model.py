@@ -0,0 +1,720 @@
+import heapq
+import random
+import shlex
+from collections import deque
+from itertools import chain
+import keys
+from utils import jitter, rng_state, set_rng_state
+from constants import *
+from terminal.scrollback import Scrollback
+from terminal.timeline import Timeline, compile_timeline, NEW_LINE
+from commands import CommandRegistry
+from navigation import format_travel_time
+from jobs import Job
+from ship_systems import diagnostic_report
+from terminal.pager import Pager
+from search_index import SearchIndex, highlight
+from input_line import InputLine, printable, split_paste
+
+
+class Typist:
+    """
+    Jitter and glitches for one compiled script. Timelines compile lazily, a chunk
+    ahead of the clock, so a script draws from its own RNG (forked from the terminal's
+    when it starts) with the degradation of that moment: the text comes out the same
+    however its compiling is spread over frames, saves and catch-ups.
+    """
+    __slots__ = ("degradation", "rng")
+
+    def __init__(self, degradation, rng):
+        self.degradation = degradation
+        self.rng = rng
+
+    def degrade_char(self, char):
+        """Apply glitch/corruption to a single character"""
+        if self.degradation > GLITCH_CHAR_THRESHOLD and self.rng.random() <= GLITCH_CHAR_CHANCE:
+            return self.rng.choice(GLITCH_CHARS)
+        return char
+
+    def next_delay(self, base_speed):
+        """Shared delay logic for both boot and responses"""
+        # Called once per typewriter frame while compiling, so jitter() is inlined:
+        # the same uniform draw, a + (b - a) * random()
+        random = self.rng.random
+        if self.degradation and random() < self.degradation / 100:
+            return base_speed * (DEGRADED_JITTER_MIN + (DEGRADED_JITTER_MAX - DEGRADED_JITTER_MIN) * random())
+        return base_speed * (NORMAL_JITTER_MIN + (NORMAL_JITTER_MAX - NORMAL_JITTER_MIN) * random())
+
+    def next_pause(self):
+        """Pause after a line marked "pause" in the script"""
+        pause_mult = jitter(DEGRADED_JITTER_MIN, DEGRADED_JITTER_MAX, self.rng) if (
+                self.degradation and self.rng.random() < self.degradation / 100
+        ) else jitter(NORMAL_JITTER_MIN, NORMAL_JITTER_MAX, self.rng)
+        return PAUSE * (pause_mult / 2)
+
+
+class TerminalModel:
+    """
+    Simulation state of a terminal: typewriter, scrollback, input and commands.
+    No arcade imports, so it runs without a window (see headless.py).
+    """
+
+    def __init__(self, build, line_spacing=int(FONT_SIZE_DEFAULT * LINE_HEIGHT_MULTIPLIER),
+                 scrollback_lines=SCROLLBACK_MAX_LINES, scrollback_bytes=SCROLLBACK_MAX_BYTES, rng=None):
+        (self.cpu_integrity,
+         self.memory_integrity,
+         self.storage_integrity,
+         self.system_degradation,
+         self.terminal_type,
+         self.boot_lines) = build
+
+        self.name = None
+
+        # All jitter and glitching draws from this, so a seeded session replays exactly
+        self.rng = rng if rng is not None else random.Random()
+
+        # Typewriter: the boot script, then each response, compiled into a timeline
+        self.timeline = None
+
+        # Ship time this terminal has been simulated to. Terminals power on at session start
+        # and are only ticked while on screen; catch_up() covers the time in between.
+        self.clock = 0.0
+        self.alerts = []  # Heap of (time, sequence, text), shown at the prompt once due
+        self.alerts_queued = 0
+
+        # General display and input
+        # All lines shown; the typewriter always writes to the newest one ([-1])
+        self.displayed_text = Scrollback(max_lines=scrollback_lines, max_bytes=scrollback_bytes)
+        # Every line the terminal has finished writing, searchable after it scrolls away
+        self.history = SearchIndex(SEARCH_HISTORY_LINES)
+        self.record_history = True  # Off while search results print, so they don't match themselves
+        self.displayed_text.on_commit = self.commit_line
+        self.scroll_offset = 0  # Lines scrolled back from the bottom
+        self.visible_lines = (SCREEN_HEIGHT - MARGIN_TOP - MARGIN_BOTTOM) // line_spacing  # Kept in sync by the view
+        self.input_mode = False
+        self.input = InputLine()  # The line being typed, with this terminal's command history
+        self.pasted = deque()  # Pasted (line, submit) pairs waiting for the prompt
+
+        # Dynamic response typewriter (for responses and future windows)
+        self.typing_response = False
+
+        self.blink_timer = 0.0
+        self.cursor_visible = True
+
+        self.commands = COMMANDS_BY_TYPE.get(self.terminal_type, TERMINAL_COMMANDS)
+        self.game_view = None  # Timestamp source, set by the owner
+        self.navigation = None  # NavigationGraph for route, set by the owner
+        self.systems = None  # ShipSystems for scan, set by the owner
+
+        # Background command (jobs.py) whose output is streaming in, if any
+        self.job = None
+        self.executor = None  # Worker pool, set by the owner; None runs jobs inline
+        self.progress_line = False  # The last line holds the job's progress indicator
+
+        # Files (vfs.VirtualFS), set by the owner when the terminal has any
+        self.filesystem = None
+        self.home = self.cwd = "/"
+        self.pager = None  # less, while it has the screen
+        self.on_exit_callback = None
+
+    def start_typing_response(self, lines):
+        """Start typing out multiple lines ({"text": str, "speed": float}) with degradation"""
+        self.timeline = self.compile_script(lines)
+        self.typing_response = True
+        # Only add the first blank line for the first response line
+        self.displayed_text.append("")
+
+    def compile_script(self, lines):
+        resolved = []
+        for line_data in lines:
+            # Dynamic timestamp replacement
+            if line_data["text"] == "TIME_STAMP":
+                if self.game_view:
+                    text = self.game_view.timestamp_at(self.clock)
+                else:
+                    text = "16 DEC 2175  SHIP TIME: 00:00:00"  # Fallback for direct testing
+                line_data = dict(line_data, text=text)
+            resolved.append(line_data)
+        typist = Typist(self.system_degradation, random.Random(self.rng.getrandbits(64)))
+        return compile_timeline(resolved, typist.next_delay, typist.degrade_char, typist.next_pause)
+
+    def reveal(self, tokens):
+        """Write timeline tokens into the scrollback"""
+        for token in tokens:
+            if token == NEW_LINE:
+                self.displayed_text.append("")
+            else:
+                self.displayed_text.append_char(token)
+
+    def skip_typing(self):
+        """Instantly finish whatever is being typed (boot or response)"""
+        if self.timeline:
+            self.reveal(self.timeline.skip())
+
+    def scroll_page(self, direction):
+        """Scroll one page back (1) or forward (-1) through the kept history"""
+        page = max(1, self.visible_lines - 1)
+        max_offset = max(0, len(self.displayed_text) - self.visible_lines)
+        self.scroll_offset = min(max_offset, max(0, self.scroll_offset + direction * page))
+
+    @property
+    def idle(self):
+        """Waiting at the prompt: only the cursor blink changes the screen"""
+        return self.input_mode and not self.typing_response and bool(self.timeline) and self.timeline.finished
+
+    def frame_key(self):
+        """Everything the view draws; the frame only needs redrawing when this changes"""
+        text = self.displayed_text
+        return (self.timeline.position if self.timeline else -1, text.start, len(text),
+                self.scroll_offset, self.input.display, self.input.cursor, self.cursor_visible,
+                self.input_mode, self.typing_response,
+                text[-1] if self.progress_line else None)
+
+    def catch_up(self, now):
+        """Bring a terminal that wasn't ticked up to ship time `now` in one step"""
+        if now > self.clock:
+            self.update(now - self.clock)
+        self.clock = now
+
+    def snapshot(self):
+        """
+        Plain-data state for a save file. Whatever the timeline has still to type is kept,
+        so a terminal saved mid-boot carries on from the same character. Background jobs
+        and less aren't saved: a job's progress line gives way to a prompt once the
+        restored typewriter finishes, and less reopens at the prompt.
+        """
+        text = self.displayed_text.snapshot()
+        if self.pager:
+            text["lines"][-1] = "> "
+        return {
+            "clock": self.clock,
+            "rng": rng_state(self.rng),
+            "boot_lines": self.boot_lines,  # Rebuilding would use the integrity at load time
+            "timeline": self.timeline.snapshot() if self.timeline else None,
+            "alerts": [list(alert) for alert in self.alerts],
+            "alerts_queued": self.alerts_queued,
+            "text": text,
+            "history": self.history.snapshot(),
+            "record_history": self.record_history,
+            "scroll_offset": self.scroll_offset,
+            "input_mode": self.input_mode,
+            "current_input": "" if self.pager else self.current_input,
+            "input_history": list(self.input.history),
+            "typing_response": self.typing_response,
+            "progress_line": self.progress_line,
+            "blink": [self.blink_timer, self.cursor_visible],
+            "cwd": self.cwd,
+        }
+
+    def restore(self, state):
+        self.clock = state["clock"]
+        set_rng_state(self.rng, state["rng"])
+        self.boot_lines = state["boot_lines"]
+        if state["timeline"] is not None:
+            self.timeline = Timeline()
+            self.timeline.restore(state["timeline"])
+        self.alerts = [tuple(alert) for alert in state["alerts"]]
+        self.alerts_queued = state["alerts_queued"]
+        self.displayed_text.restore(state["text"])
+        self.history.restore(state["history"])
+        self.record_history = state["record_history"]
+        self.scroll_offset = state["scroll_offset"]
+        self.input_mode = state["input_mode"]
+        self.current_input = state["current_input"]
+        self.input.history.extend(state["input_history"])
+        self.typing_response = state["typing_response"]
+        self.progress_line = state["progress_line"]
+        self.blink_timer, self.cursor_visible = state["blink"]
+        self.cwd = state["cwd"]
+
+    def queue_alert(self, time, text):
+        heapq.heappush(self.alerts, (time, self.alerts_queued, text))
+        self.alerts_queued += 1
+
+    def deliver_alerts(self):
+        """Print due alerts above the prompt; they wait while the terminal is typing"""
+        while self.alerts and self.alerts[0][0] <= self.clock and self.input_mode and not self.typing_response:
+            _, _, text = heapq.heappop(self.alerts)
+            self.print_above_prompt(text)
+
+    def print_above_prompt(self, text):
+        prompt = self.displayed_text[-1]
+        self.displayed_text[-1] = text
+        self.displayed_text.append(prompt)
+
+    def update(self, delta_time):
+        self.blink_timer += delta_time
+        if self.blink_timer >= CURSOR_BLINK_INTERVAL:
+            self.blink_timer = 0
+            self.cursor_visible = not self.cursor_visible
+
+        # Boot script is compiled before the clock moves so TIME_STAMP reads the power-on time
+        if self.timeline is None:
+            self.timeline = self.compile_script(self.boot_lines)
+        self.clock += delta_time
+
+        self.reveal(self.timeline.advance(delta_time))
+
+        if self.job and self.timeline.finished:
+            self.stream_job()
+
+        if self.timeline.finished:
+            if not self.input_mode:
+                # Boot finished → enable input
+                self.input_mode = True
+                self.cursor_visible = True
+            elif self.typing_response and not self.job:
+                # All responses done → add final prompt
+                self.end_response()
+
+        self.deliver_alerts()
+        if self.pasted:
+            self.type_pasted()
+
+    @property
+    def current_input(self):
+        return self.input.text
+
+    @current_input.setter
+    def current_input(self, text):
+        self.input.set(text)
+
+    def key_press(self, key, modifiers):
+        if self.pager:
+            self.pager_key(key, modifiers)
+            return
+
+        # Escape and Ctrl-C leave a reverse search, not the terminal
+        if self.input.searching and self.input.key_press(key, modifiers):
+            return
+
+        if key == keys.ESCAPE:
+            self.pasted.clear()
+            self.cancel_job()
+            if self.on_exit_callback:
+                self.on_exit_callback()
+            return
+
+        # Scrollback works during boot and responses too
+        if key in (keys.PAGEUP, keys.PAGEDOWN):
+            self.scroll_page(1 if key == keys.PAGEUP else -1)
+            return
+
+        if key == keys.C and modifiers & keys.MOD_CTRL:
+            self.interrupt()
+            return
+
+        if not self.input_mode or self.typing_response:
+            return
+
+        # Any input snaps back to the live prompt
+        self.scroll_offset = 0
+
+        if key == keys.ENTER:
+            self.submit_input()
+        elif key == keys.TAB:
+            self.complete_input()
+        elif keys.typed(key, modifiers):
+            self.insert_text(chr(key))
+        else:
+            self.input.key_press(key, modifiers)
+
+    def type_text(self, text):
+        """Text from the keyboard (the window's on_text), typed at the prompt"""
+        if self.pager:
+            # less takes its space/b/q from here: the views send printable keys as text only
+            for char in text:
+                if self.pager:
+                    self.pager_key(ord(char.lower()), 0)
+            return
+        if self.input_mode and not self.typing_response:
+            self.scroll_offset = 0
+            self.insert_text(printable(text))
+
+    def insert_text(self, text):
+        # Typed characters glitch like printed ones on a badly degraded terminal
+        if self.system_degradation > GLITCH_CHAR_THRESHOLD:
+            text = "".join(self.rng.choice(GLITCH_CHARS) if self.rng.random() < GLITCH_CHAR_CHANCE else char
+                           for char in text)
+        self.input.insert(text)
+
+    def paste(self, text):
+        self.feed(split_paste(text))
+
+    def feed(self, pasted):
+        """Take pasted (line, submit) pairs; each is typed in once the prompt is free again"""
+        self.pasted.extend(pasted)
+        pasted.clear()
+        self.type_pasted()
+
+    def type_pasted(self):
+        while self.pasted and self.input_mode and not (self.typing_response or self.job or self.pager):
+            line, submit = self.pasted.popleft()
+            self.insert_text(printable(line))
+            if submit:
+                self.submit_input()
+
+    def submit_input(self):
+        """ENTER: echo the line and run it"""
+        self.scroll_offset = 0
+        line = self.input.submit()
+        full_line = "> " + line
+
+        # Commit the typed command to the last line
+        if self.displayed_text:
+            self.displayed_text[-1] = full_line
+        else:
+            self.displayed_text.append(full_line)
+
+        # Get response from command (only the command word is case-insensitive, not file names)
+        response_texts = self.process_command(line.strip())
+
+        if response_texts:
+            # Normal case: type out the response with degradation
+            typed_lines = [{"text": line, "speed": FAST} for line in response_texts]
+            self.start_typing_response(typed_lines)
+        elif not (self.job or self.pager):
+            # Special case: no response lines (e.g. clear or empty enter)
+            # → instantly add a fresh prompt
+            self.displayed_text.append("> ")
+
+    def process_command(self, command):
+        if not command:
+            return [""]
+        entry, args = self.commands.parse(command)
+        if entry is None:
+            return [f"Command not found: {command}"]
+        if entry.background:
+            self.start_job(entry.name, entry.handler(self, *args))
+            return []
+        return entry.handler(self, *args)
+
+    def start_job(self, name, output):
+        """Run a command's output iterator in the background; update() types it as it arrives"""
+        self.job = Job(name, output)
+        self.typing_response = True
+        self.progress_line = False
+        self.job.start(self.executor)
+
+    def stream_job(self):
+        """Typewriter is free: type the job's new lines, or show its progress while it works"""
+        lines = self.job.collect()
+        if lines:
+            if self.progress_line:
+                self.displayed_text[-1] = ""
+            else:
+                self.displayed_text.append("")
+            self.progress_line = False
+            self.timeline = self.compile_script([{"text": line, "speed": FAST} for line in lines])
+        elif self.job.finished:
+            self.job = None
+        else:
+            indicator = self.progress_indicator()
+            if self.progress_line:
+                self.displayed_text[-1] = indicator
+            else:
+                self.displayed_text.append(indicator)
+                self.progress_line = True
+
+    def progress_indicator(self):
+        spinner = "|/-\\"[int(self.clock * 8) % 4]
+        if self.job.progress is None:
+            return f"{spinner} {self.job.name}..."
+        done = int(self.job.progress * PROGRESS_BAR_WIDTH)
+        bar = "#" * done + "." * (PROGRESS_BAR_WIDTH - done)
+        return f"{spinner} {self.job.name} [{bar}] {self.job.progress:4.0%}"
+
+    def interrupt(self):
+        """Ctrl-C: cancel the running job, or abandon the line being typed (and anything pasted after it)"""
+        self.pasted.clear()
+        if self.job:
+            self.cancel_job()
+        elif self.input_mode and not self.typing_response:
+            self.displayed_text[-1] = f"> {self.current_input}^C"
+            self.end_response()
+
+    def cancel_job(self):
+        """
+        Stop the background command, if any, and come back to a prompt. Needed whenever the
+        terminal stops being ticked (logout, shutdown): nothing would collect the job's
+        output, so its worker would wait on a full queue (or tail -f forever).
+        """
+        if not self.job:
+            return
+        self.job.cancel()
+        self.job = None
+        self.timeline = self.compile_script([])  # Drop whatever was still to be typed
+        if self.progress_line:
+            self.displayed_text[-1] = "^C"
+            self.progress_line = False
+        else:
+            self.displayed_text.append("^C")
+        self.end_response()
+
+    def end_response(self):
+        """Response done → fresh prompt (over the progress indicator if one is showing)"""
+        self.typing_response = False
+        if self.progress_line:
+            self.displayed_text[-1] = "> "
+            self.progress_line = False
+        else:
+            self.displayed_text.append("> ")
+        self.current_input = ""
+        self.record_history = True
+
+    def commit_line(self, text):
+        if self.record_history:
+            self.history.add(text)
+
+    def complete_input(self):
+        """Tab: extend the input to the longest unambiguous completion, or list the options"""
+        completed, candidates = self.commands.complete(self.current_input)
+        if len(completed) > len(self.current_input):
+            self.current_input = completed
+        elif len(candidates) > 1:
+            self.print_above_prompt("  ".join(candidates))
+
+    def cmd_help(self):
+        return ["Available commands:"] + [f"  {entry.name:<7} - {entry.help}" for entry in self.commands.commands]
+
+    def cmd_status(self):
+        return [
+            f"System degradation: {self.system_degradation}%",
+            f"CPU: {self.cpu_integrity}%   Memory: {self.memory_integrity}%   Storage: {self.storage_integrity}%",
+            f"Scrollback: {len(self.displayed_text)}/{self.displayed_text.max_lines} lines   "
+            f"{self.displayed_text.byte_size / 1024:.1f}/{self.displayed_text.max_bytes / 1024:.0f} KB"
+        ]
+
+    def cmd_clear(self):
+        self.displayed_text.clear()
+        self.displayed_text.append("> ")
+        self.scroll_offset = 0
+        self.current_input = ""
+        return []
+
+    def cmd_route(self, query):
+        if not self.navigation:
+            return ["Navigation data unavailable."]
+        origin, to, destination = query.partition(" to ")
+        if not to:
+            origin, destination = None, query
+        if not destination:
+            return ["Usage: route <room>  or  route <room> to <room>"]
+
+        origin_id = self.navigation.find(origin) if origin else self.navigation.terminal_room(self.name)
+        target_id = self.navigation.find(destination)
+        for text, room_id in ((origin or "this terminal", origin_id), (destination, target_id)):
+            if room_id is None:
+                return [f"Unknown location: {text}"]
+
+        route = self.navigation.route(origin_id, target_id)
+        if route is None:
+            return [f"No route to {self.navigation.name(target_id).upper()}."]
+        lines = [f"Route: {self.navigation.name(origin_id).upper()} -> {self.navigation.name(target_id).upper()}"]
+        for step, (word, room_id) in enumerate(zip(route.exits, route.rooms[1:]), 1):
+            lines.append(f"  {step:>2}. {word:<10} {self.navigation.name(room_id)}")
+        steps = "step" if route.steps == 1 else "steps"
+        lines.append(f"Estimated transit: {format_travel_time(route.travel_time)} ({route.steps} {steps})")
+        return lines
+
+    def cmd_scan(self):
+        if not self.systems:
+            return iter(["Ship systems offline."])
+        # Copied now, on the main thread; the scan itself runs on a worker
+        return diagnostic_report(self.systems.names, self.systems.shown.copy())
+
+    def find_file(self, command, path):
+        """(virtual path, None) for a file typed at this terminal, or (None, error line)"""
+        if not self.filesystem:
+            return None, "No filesystem mounted."
+        if not path:
+            return None, f"usage: {command} <file>"
+        target = self.filesystem.resolve(self.cwd, path)
+        if self.filesystem.isdir(target):
+            return None, f"{command}: {path}: Is a directory"
+        if not self.filesystem.isfile(target):
+            return None, f"{command}: {path}: No such file or directory"
+        return target, None
+
+    def cmd_ls(self, path):
+        if not self.filesystem:
+            return ["No filesystem mounted."]
+        target = self.filesystem.resolve(self.cwd, path)
+        if self.filesystem.isfile(target):
+            return [path]
+        if not self.filesystem.isdir(target):
+            return [f"ls: {path}: No such file or directory"]
+        entries = self.filesystem.listdir(target)
+        return ["  ".join(entries)] if entries else []
+
+    def cmd_cd(self, path):
+        if not self.filesystem:
+            return ["No filesystem mounted."]
+        target = self.filesystem.resolve(self.cwd, path or self.home)
+        if not self.filesystem.isdir(target):
+            return [f"cd: {path}: No such directory"]
+        self.cwd = target
+        return []
+
+    def cmd_pwd(self):
+        return [self.cwd] if self.filesystem else ["No filesystem mounted."]
+
+    def cmd_cat(self, path):
+        target, error = self.find_file("cat", path)
+        if error:
+            return iter([error])
+        log = self.filesystem.open(target)
+        return _closing(log, log.stream())
+
+    def cmd_tail(self, query):
+        words = query.split()
+        follow = "-f" in words
+        count = TAIL_LINES
+        paths = []
+        for i, word in enumerate(words):
+            if word.startswith("-") and word[1:].isdigit():
+                count = int(word[1:])
+            elif word == "-n" and i + 1 < len(words) and words[i + 1].isdigit():
+                count = int(words[i + 1])
+            elif not word.startswith("-") and not (i and words[i - 1] == "-n"):
+                paths.append(word)
+        target, error = self.find_file("tail", paths[0] if paths else "")
+        if error:
+            return iter([error])
+
+        log = self.filesystem.open(target)
+        lines, end = log.tail(count)
+        if follow:
+            # Runs until Ctrl-C, showing lines as they are appended
+            return _closing(log, chain(lines, log.follow(end)))
+        log.close()
+        return iter(lines)
+
+    def cmd_less(self, path):
+        target, error = self.find_file("less", path)
+        if error:
+            return [error]
+        self.pager = Pager(self.filesystem.open(target), target, self.visible_lines - 1)
+        self.displayed_text.append("")  # Status line
+        self.pager_show(self.pager.page())
+        return []
+
+    def pager_show(self, lines):
+        # The status line stays last: new lines go in above it
+        for line in lines:
+            self.print_above_prompt(line)
+        self.displayed_text[-1] = self.pager.status()
+
+    def pager_key(self, key, modifiers):
+        if key in (keys.SPACE, keys.PAGEDOWN):
+            lines = self.pager.next_page()
+        elif key in (keys.ENTER, keys.DOWN):
+            line = self.pager.next_line()
+            lines = None if line is None else [line]
+        elif key in (keys.B, keys.PAGEUP):
+            lines = self.pager.previous_page()
+        elif key in (keys.Q, keys.ESCAPE) or (key == keys.C and modifiers & keys.MOD_CTRL):
+            self.pager.close()
+            self.pager = None
+            self.displayed_text[-1] = "> "
+            self.current_input = ""
+            return
+        else:
+            return
+        if lines:
+            self.pager_show(lines)
+
+    def cmd_search(self, query):
+        if not query:
+            return ["usage: search <text>"]
+        self.record_history = False
+        # The most recent matches, listed in the order they were printed
+        numbers = self.history.search(query, SEARCH_MAX_RESULTS + 1, newest_first=True)
+        lines = [highlight(self.history.text(number), query) for number in reversed(numbers[:SEARCH_MAX_RESULTS])]
+        return lines + [_match_summary(len(numbers), "latest")]
+
+    def cmd_grep(self, query):
+        try:
+            words = shlex.split(query)
+        except ValueError as e:
+            return iter([f"grep: {e}"])
+        if not words:
+            return iter(["usage: grep <text> [file ...]"])
+        pattern, paths = words[0], words[1:]
+        if not paths:
+            return iter(self.cmd_search(pattern))
+
+        targets = []
+        for path in paths:
+            target, error = self.find_file("grep", path)
+            if error:
+                return iter([error])
+            targets.append((path, target))
+        self.record_history = False
+        return _grep_files(self.filesystem, targets, pattern)
+
+    def cmd_exit(self):
+        self.cancel_job()
+        if self.on_exit_callback:
+            self.on_exit_callback()
+            return ["Logging out..."]
+        return []
+
+
+def _closing(log, lines):
+    """Job output that closes its log when finished or cancelled"""
+    try:
+        yield from lines
+    finally:
+        log.close()
+
+
+def _match_summary(count, which="first"):
+    if count > SEARCH_MAX_RESULTS:
+        return f"({which} {SEARCH_MAX_RESULTS} matches shown)"
+    return f"{count} match{'' if count == 1 else 'es'}"
+
+
+def _grep_files(filesystem, targets, pattern):
+    """Job output: bring each file's index up to date, then list its matching lines"""
+    found = 0
+    for path, target in targets:
+        if found > SEARCH_MAX_RESULTS:
+            break
+        log = filesystem.open(target)
+        try:
+            index = filesystem.log_index(target)
+            yield from index.update(log)
+        finally:
+            log.close()
+        for number, text in index.search(pattern, SEARCH_MAX_RESULTS + 1 - found):
+            found += 1
+            if found > SEARCH_MAX_RESULTS:
+                break
+            yield f"{path}:{number + 1}: {highlight(text, pattern)}"
+    yield _match_summary(found)
+
+
+# Commands every terminal understands; a terminal may be given its own registry
+TERMINAL_COMMANDS = CommandRegistry()
+TERMINAL_COMMANDS.add("help", TerminalModel.cmd_help, "Show this help")
+TERMINAL_COMMANDS.add("status", TerminalModel.cmd_status, "Show system status")
+TERMINAL_COMMANDS.add("clear", TerminalModel.cmd_clear, "Clear terminal")
+TERMINAL_COMMANDS.add("ls", TerminalModel.cmd_ls, "List files", args=True)
+TERMINAL_COMMANDS.add("cd", TerminalModel.cmd_cd, "Change directory", args=True)
+TERMINAL_COMMANDS.add("pwd", TerminalModel.cmd_pwd, "Show current directory")
+TERMINAL_COMMANDS.add("cat", TerminalModel.cmd_cat, "Print a file", args=True, background=True)
+TERMINAL_COMMANDS.add("less", TerminalModel.cmd_less, "Page through a file", args=True)
+TERMINAL_COMMANDS.add("tail", TerminalModel.cmd_tail, "End of a file (-n N, -f to follow)", args=True, background=True)
+TERMINAL_COMMANDS.add("search", TerminalModel.cmd_search, "Find text in this terminal's history", args=True)
+TERMINAL_COMMANDS.add("grep", TerminalModel.cmd_grep, "Find text in files (grep <text> <file>...)", args=True, background=True)
+TERMINAL_COMMANDS.add("exit", TerminalModel.cmd_exit, "Return to menu / quit", aliases=("quit", "back", "leave"),
+                      exact=True)
+
+MOTHER_COMMANDS = CommandRegistry()
+MOTHER_COMMANDS.extend(TERMINAL_COMMANDS)
+MOTHER_COMMANDS.add("route", TerminalModel.cmd_route, "Plot a course between rooms", args=True)
+MOTHER_COMMANDS.add("scan", TerminalModel.cmd_scan, "Full ship systems diagnostic",
+                    aliases=("diagnostic",), background=True)
+
+COMMANDS_BY_TYPE = {"MOTHER": MOTHER_COMMANDS}
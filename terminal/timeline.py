@@ -0,0 +1,131 @@
+from array import array
+from bisect import bisect_right
+from itertools import islice
+from constants import FAST, TYPEWRITER_STEP
+
+NEW_LINE = "\n"  # Token that starts a fresh output line (never produced by glitching)
+COMPILE_CHUNK = 64  # Tokens compiled at a time, just ahead of the clock
+
+
+class Timeline:
+    """
+    A typewriter script as absolute reveal times: every output token — a character,
+    or NEW_LINE — has one, so advancing is a bisect on the elapsed time instead of
+    stepping a state machine frame by frame.
+
+    Tokens come from a compiler iterator and are compiled in chunks only as far as the
+    clock has reached, so starting even a huge response costs one chunk on its frame.
+    """
+
+    def __init__(self, compiler=None):
+        self.times = []   # Reveal time of each token, non-decreasing
+        self.tokens = []
+        self.clock = 0.0
+        self.position = 0  # Tokens already handed out
+        self.compiler = compiler  # (time, token) pairs still to compile; None once exhausted
+
+    def add(self, time, token):
+        self.times.append(time)
+        self.tokens.append(token)
+
+    def _compile_until(self, time):
+        """Compile until a token lands after `time` (or the script ends)"""
+        while self.compiler is not None and (not self.times or self.times[-1] <= time):
+            chunk = list(islice(self.compiler, COMPILE_CHUNK))
+            if len(chunk) < COMPILE_CHUNK:
+                self.compiler = None
+            for token_time, token in chunk:
+                self.times.append(token_time)
+                self.tokens.append(token)
+
+    def _compile_all(self):
+        self._compile_until(float("inf"))
+
+    @property
+    def duration(self):
+        self._compile_all()
+        return self.times[-1] if self.times else 0.0
+
+    @property
+    def finished(self):
+        if self.position < len(self.tokens):
+            return False
+        if self.compiler is not None:
+            self._compile_until(self.clock)  # Anything left, or is the script done?
+        return self.position >= len(self.tokens)
+
+    def advance(self, delta_time):
+        """Move the clock forward and return the tokens revealed since the last call"""
+        return self.seek(self.clock + delta_time)
+
+    def seek(self, time):
+        """Jump to an absolute time (forward only) and return the newly revealed tokens"""
+        if time > self.clock:
+            self.clock = time
+        if self.compiler is not None and (not self.times or self.times[-1] <= self.clock):
+            self._compile_until(self.clock)
+        end = bisect_right(self.times, self.clock)
+        revealed = self.tokens[self.position:end]
+        self.position = max(self.position, end)
+        return revealed
+
+    def skip(self):
+        """Reveal everything that is left"""
+        return self.seek(self.duration)
+
+    def snapshot(self):
+        """The part still to be typed; tokens are single characters, so they pack into a string"""
+        self._compile_all()
+        return {"clock": self.clock, "times": array("d", self.times[self.position:]).tobytes(),
+                "tokens": "".join(self.tokens[self.position:])}
+
+    def restore(self, state):
+        times = array("d")
+        times.frombytes(state["times"])
+        self.times = times.tolist()
+        self.tokens = list(state["tokens"])
+        self.clock = state["clock"]
+        self.position = 0
+        self.compiler = None
+
+
+def compile_timeline(lines, next_delay, degrade_char, next_pause, step=TYPEWRITER_STEP):
+    """
+    A Timeline for script lines ({"text", "speed", "pause", "same_line"}), compiled lazily.
+
+    Delays and glitches are drawn from the given callables as the timeline compiles, so
+    they should not depend on when that happens (see terminal_model.Typist). The pacing
+    replays the old per-frame typewriter at a fixed step: a fresh delay is rolled
+    every frame, several characters can land in one frame, and finishing a line
+    ends the frame — so scripts keep the rhythm they were tuned for.
+    """
+    return Timeline(_compile(lines, next_delay, degrade_char, next_pause, step))
+
+
+def _compile(lines, next_delay, degrade_char, next_pause, step):
+    """(time, token) pairs of a script, in order"""
+    time = timer = step  # End of the first frame
+
+    for idx, line_data in enumerate(lines):
+        speed = line_data.get("speed", FAST)
+        delay = next_delay(speed)
+        for char in line_data["text"]:
+            while timer < delay:
+                time += step
+                timer += step
+                delay = next_delay(speed)
+            timer -= delay
+            if char != " ":  # Spaces never glitch
+                char = degrade_char(char)
+            yield time, char
+
+        # Line done
+        if line_data.get("pause"):
+            timer = -next_pause()
+
+        next_idx = idx + 1
+        if next_idx < len(lines) and not lines[next_idx].get("same_line"):
+            yield time, NEW_LINE
+
+        time += step
+        timer += step
@@ -0,0 +1,103 @@
+# terminal_registry.py
+from collections.abc import Mapping
+
+from utils import build_terminal
+from ship_systems import ShipSystems
+from vfs import VirtualFS
+
+
+class TerminalRegistry(Mapping):
+    """
+    Every ship terminal by name, built on first lookup. All terminals power on with the
+    session; until someone looks at one it is only a spec, an RNG and any queued alerts.
+    Once built, a terminal is still only ticked while on screen and catches up on
+    activation (TerminalModel.catch_up), so unwatched terminals cost nothing per frame.
+
+    The registry also owns the live ShipSystems model: it runs on the game clock, sets the
+    integrity a terminal is built with and keeps built terminals' degradation current.
+
+    factory(spec, build, rng) returns a TerminalModel, or a view holding one in .model.
+    """
+
+    def __init__(self, specs, game_state, factory, navigation=None, executor=None):
+        self.specs = {spec["name"]: spec for spec in specs}
+        self.game_state = game_state
+        self.factory = factory
+        self.navigation = navigation
+        self.executor = executor  # Worker pool for background commands; None runs them inline
+        # Seeds are drawn up front in spec order, so streams don't depend on visiting order
+        self.rngs = {name: game_state.spawn_rng() for name in self.specs}
+        self.built = {}
+        self.filesystems = {}  # root directory -> VirtualFS, shared by terminals mounting it
+        self.pending_alerts = {}  # name -> [(time, text)] for terminals not built yet
+
+        # Drawn after the terminal seeds, so adding it left their streams unchanged
+        self.systems = ShipSystems(specs, game_state.spawn_rng().getrandbits(64))
+        self.systems.on_failure = self.report_failure
+        game_state.subscribe(self.systems.update)
+
+    def __getitem__(self, name):
+        terminal = self.built.get(name)
+        if terminal is None:
+            spec = self.specs[name]  # KeyError for unknown names, as a dict would
+            rng = self.rngs[name]
+            integrity = self.systems.integrity_of(name)
+            terminal = self.factory(spec, build_terminal(integrity, spec["type"], rng), rng)
+            model = getattr(terminal, "model", terminal)
+            model.name = name
+            model.game_view = self.game_state
+            model.navigation = self.navigation
+            model.systems = self.systems
+            model.executor = self.executor
+            if spec.get("filesystem"):
+                root = spec["filesystem"]
+                model.filesystem = self.filesystems.setdefault(root, VirtualFS(root))
+                model.home = model.cwd = spec.get("home", "/")
+            self.systems.attach(name, model)
+            for time, text in self.pending_alerts.pop(name, ()):
+                model.queue_alert(time, text)
+            self.built[name] = terminal
+        return terminal
+
+    def __iter__(self):
+        return iter(self.specs)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def snapshot(self):
+        # Unbuilt terminals are still their spec and an untouched RNG, which the seed recreates
+        return {
+            "systems": self.systems.snapshot(),
+            "built": {name: getattr(terminal, "model", terminal).snapshot() for name, terminal in self.built.items()},
+            "pending_alerts": {name: [list(alert) for alert in alerts] for name, alerts in self.pending_alerts.items()},
+        }
+
+    def restore(self, state):
+        # Systems first: terminals are built with (and fed) the saved integrity
+        self.systems.restore(state["systems"])
+        for name, terminal_state in state["built"].items():
+            getattr(self[name], "model", self[name]).restore(terminal_state)
+        self.pending_alerts = {name: [tuple(alert) for alert in alerts]
+                               for name, alerts in state["pending_alerts"].items()}
+
+    def cancel_jobs(self):
+        """Stop every terminal's background command, e.g. before the worker pool shuts down"""
+        for terminal in self.built.values():
+            getattr(terminal, "model", terminal).cancel_job()
+
+    def queue_alert(self, text, names=None, time=None):
+        """Post an alert to terminals (all by default), shown once each reaches `time`"""
+        time = self.game_state.elapsed_seconds if time is None else time
+        for name in names or self.specs:
+            terminal = self.built.get(name)
+            if terminal is None:
+                self.pending_alerts.setdefault(name, []).append((time, text))
+            else:
+                getattr(terminal, "model", terminal).queue_alert(time, text)
+
+    def report_failure(self, name, component):
+        self.queue_alert(f"** WARNING: {component.upper()} FAILURE **", [name])
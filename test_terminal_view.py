@@ -0,0 +1,61 @@
+# test_terminal_view.py
+# Keys sent the way a real window sends them: on_key_press for every key, then on_text
+# for the printable ones. Needs arcade's headless (EGL) backend; skipped without it.
+import os
+
+import pytest
+
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+arcade = pytest.importorskip("arcade")
+
+
+@pytest.fixture(scope="module")
+def game():
+    from main import MyGame
+    try:
+        window = MyGame(seed=5)
+    except Exception as e:
+        pytest.skip(f"no GL context: {e}")
+    window._allow_dispatch_event = True
+    yield window
+    window.on_close()
+
+
+def press(window, key, text=None):
+    window.dispatch_event("on_key_press", key, 0)
+    if text is not None:
+        window.dispatch_event("on_text", text)
+    window.dispatch_event("on_key_release", key, 0)
+
+
+def type_line(window, line):
+    for char in line:
+        press(window, ord(char.lower()), char)
+    press(window, arcade.key.ENTER, "\r")
+
+
+def test_pager_keys_through_views(game):
+    type_line(game, "north")
+    type_line(game, "use terminal")
+    model = game.terminals["mother"].model
+    for _ in range(3000):
+        game.on_update(1 / 30)
+        if model.idle:
+            break
+    type_line(game, "less /var/log/system.log")
+    for _ in range(60):
+        game.on_update(1 / 30)
+    assert model.pager is not None
+    status = model.displayed_text[-1]
+
+    press(game, arcade.key.SPACE, " ")
+    assert model.displayed_text[-1] != status
+
+    press(game, arcade.key.B, "b")
+    assert model.displayed_text[-1] == status
+
+    press(game, arcade.key.Q, "q")
+    assert model.pager is None
+    assert model.displayed_text[-1] == "> "
@@ -0,0 +1,65 @@
+# texture_cache.py
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+from constants import TEXTURE_BUDGET_BYTES
+
+
+def _texture_bytes(texture):
+    return texture.width * texture.height * 4  # RGBA
+
+
+class TextureCache:
+    """
+    Loads textures on first use, shares them between everyone asking for the same file,
+    and evicts the least recently used ones once past the memory budget.
+
+    prefetch() decodes files on a worker thread. Only the main thread touches the cache
+    itself (get / prefetch adopt finished loads), so eviction never races the renderer.
+    Evicted textures leave the GPU atlas once no sprite references them any more.
+    """
+
+    def __init__(self, budget_bytes=TEXTURE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.textures = OrderedDict()  # path -> arcade.Texture, oldest first
+        self.total_bytes = 0
+        self.pending = {}  # path -> Future from the prefetch thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="texture-prefetch")
+
+    def get(self, path):
+        self._adopt_finished()
+        texture = self.textures.get(path)
+        if texture is not None:
+            self.textures.move_to_end(path)
+            return texture
+
+        future = self.pending.pop(path, None)
+        texture = future.result() if future else arcade.load_texture(path)
+        self._store(path, texture)
+        return texture
+
+    def prefetch(self, paths):
+        """Start decoding files that are neither cached nor already loading"""
+        self._adopt_finished()
+        for path in paths:
+            if path and path not in self.textures and path not in self.pending:
+                self.pending[path] = self.executor.submit(arcade.load_texture, path)
+
+    def _adopt_finished(self):
+        for path, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[path]
+                if future.exception() is None:
+                    self._store(path, future.result())
+
+    def _store(self, path, texture):
+        self.textures[path] = texture
+        self.total_bytes += _texture_bytes(texture)
+        # Never evict the texture that was just asked for
+        while self.total_bytes > self.budget_bytes and len(self.textures) > 1:
+            _, evicted = self.textures.popitem(last=False)
+            self.total_bytes -= _texture_bytes(evicted)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
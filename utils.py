@@ -2,8 +2,17 @@ import random
 from terminal.boot_sequence import universal_boot_sequence
 
 
-def jitter(min_val, max_val):
-    return random.uniform(min_val, max_val)
+def jitter(min_val, max_val, rng=random):
+    return rng.uniform(min_val, max_val)
+
+def rng_state(rng):
+    """A random.Random's state as plain lists, for save files"""
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+def set_rng_state(rng, state):
+    version, internal, gauss = state
+    rng.setstate((version, tuple(internal), gauss))
 
 def system_checks(components):
     """
@@ -34,10 +43,10 @@ def system_checks(components):
 
     return max(0, round(total_degradation))
 
-def build_terminal(terminal_integrity, terminal_type):
+def build_terminal(terminal_integrity, terminal_type, rng=random):
 
     total_system_degradation = system_checks(terminal_integrity)
-    message = universal_boot_sequence(terminal_integrity, terminal_type)
+    message = universal_boot_sequence(terminal_integrity, terminal_type, rng)
 
     return (terminal_integrity["cpu"],
             terminal_integrity["memory"],
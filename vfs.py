@@ -0,0 +1,196 @@
+# vfs.py
+# The files a terminal can browse: a directory on disk (e.g. resources/fs) shown as "/".
+# Logs are memory-mapped and only the parts being read are decoded, so a multi-megabyte
+# log opens instantly and cat/less/tail never split the whole file into lines.
+import mmap
+import os
+import posixpath
+import threading
+from array import array
+
+from constants import LOG_PAGE_BYTES
+from search_index import SearchIndex
+
+
+def _decode(raw):
+    return raw.decode("utf-8", errors="replace").rstrip("\r")
+
+
+class LogFile:
+    """
+    A read-only log on disk. Line offsets for random access (less) are indexed one page
+    of LOG_PAGE_BYTES at a time as reads reach them; streaming (cat) and the tail need
+    no index at all. remap() picks up growth for tail -f.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = None
+        self.size = 0
+        self.starts = array("q", [0])  # Byte offset where each indexed line starts
+        self.indexed = 0  # Bytes scanned for line breaks so far
+        self.remap()
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+    def remap(self):
+        """Map the file again if its size changed (an empty file can't be mapped)"""
+        size = os.fstat(self.file.fileno()).st_size
+        if size != self.size:
+            if self.data is not None:
+                self.data.close()
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            self.size = size
+            if self.indexed > size:  # Truncated (log rotated): start over
+                self.starts = array("q", [0])
+                self.indexed = 0
+        return size
+
+    def _index_to(self, line):
+        """Scan pages until the start of `line` is known or the file ends"""
+        while len(self.starts) <= line and self.indexed < self.size:
+            end = min(self.size, self.indexed + LOG_PAGE_BYTES)
+            position = self.data.find(b"\n", self.indexed, end)
+            while position != -1:
+                self.starts.append(position + 1)
+                position = self.data.find(b"\n", position + 1, end)
+            self.indexed = end
+
+    def _known_lines(self):
+        count = len(self.starts) - 1
+        if self.indexed == self.size and self.starts[-1] < self.size:
+            count += 1  # Last line has no line break
+        return count
+
+    def lines(self, first, count):
+        """Up to `count` lines from line number `first`, reading only the pages they are on"""
+        self._index_to(first + count)
+        last = min(first + count, self._known_lines())
+        result = []
+        for i in range(first, last):
+            end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else self.size
+            result.append(_decode(self.data[self.starts[i]:end]))
+        return result
+
+    def offset_of(self, line):
+        self._index_to(line)
+        return self.starts[min(line, len(self.starts) - 1)]
+
+    def stream(self, offset=0, end=None):
+        """Every line from a byte offset on (to `end`), one page at a time"""
+        end = self.size if end is None else end
+        carry = b""
+        while offset < end:
+            stop = min(end, offset + LOG_PAGE_BYTES)
+            *complete, carry = (carry + self.data[offset:stop]).split(b"\n")
+            for raw in complete:
+                yield _decode(raw)
+            offset = stop
+        if carry:
+            yield _decode(carry)
+
+    def complete_end(self):
+        """Byte offset just past the last line break; a line still being written comes after it"""
+        return self.data.rfind(b"\n") + 1 if self.size else 0
+
+    def tail(self, count):
+        """(last `count` lines, byte offset where the file ends) without reading the rest"""
+        if not self.size:
+            return [], 0
+        end = self.size - 1 if self.data[self.size - 1] == ord("\n") else self.size
+        start = end
+        for _ in range(count):
+            start = self.data.rfind(b"\n", 0, start)
+            if start == -1:
+                break
+        lines = self.data[start + 1:end].split(b"\n") if count else []
+        return [_decode(raw) for raw in lines], self.size
+
+    def follow(self, offset):
+        """Lines appended after `offset`, forever; yields None whenever nothing is new yet"""
+        carry = b""
+        while True:
+            if self.remap() < offset:
+                offset, carry = 0, b""
+            if self.size > offset:
+                *complete, carry = (carry + self.data[offset:self.size]).split(b"\n")
+                offset = self.size
+                for raw in complete:
+                    yield _decode(raw)
+            else:
+                yield None
+
+
+class LogIndex:
+    """
+    SearchIndex over a log's lines (line number = index number), shared by every grep of
+    that file and extended with whatever was appended since the last one.
+    """
+
+    def __init__(self):
+        self.index = SearchIndex()
+        self.offset = 0  # Bytes indexed so far, always at a line break
+        self.lock = threading.Lock()  # Greps may run on several workers at once
+
+    def update(self, log):
+        """Index new complete lines a page at a time; yields progress between pages"""
+        end = log.complete_end()
+        while True:
+            with self.lock:
+                if end < self.offset:  # Truncated: start over
+                    self.index, self.offset = SearchIndex(), 0
+                if self.offset >= end:
+                    return
+                stop = min(end, self.offset + LOG_PAGE_BYTES)
+                stop = log.data.rfind(b"\n", self.offset, stop) + 1 or log.data.find(b"\n", stop) + 1
+                for line in log.stream(self.offset, stop):
+                    self.index.add(line)
+                self.offset = stop
+            yield self.offset / end
+
+    def search(self, query, limit=None):
+        with self.lock:
+            return [(number, self.index.text(number)) for number in self.index.search(query, limit)]
+
+
+class VirtualFS:
+    """A directory on disk presented as "/". Paths can't climb out of it"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.indexes = {}  # real path -> LogIndex
+        self.lock = threading.Lock()
+
+    def resolve(self, cwd, path):
+        """Absolute virtual path for `path` typed in directory `cwd`"""
+        return "/" + posixpath.normpath(posixpath.join(cwd, path)).lstrip("/") if path else cwd
+
+    def real(self, path):
+        return os.path.join(self.root, *[part for part in path.split("/") if part])
+
+    def isdir(self, path):
+        return os.path.isdir(self.real(path))
+
+    def isfile(self, path):
+        return os.path.isfile(self.real(path))
+
+    def listdir(self, path):
+        """Sorted entries, directories marked with a trailing slash"""
+        real = self.real(path)
+        return sorted(name + "/" if os.path.isdir(os.path.join(real, name)) else name
+                      for name in os.listdir(real))
+
+    def open(self, path):
+        return LogFile(self.real(path))
+
+    def log_index(self, path):
+        real = self.real(path)
+        with self.lock:
+            index = self.indexes.get(real)
+            if index is None:
+                index = self.indexes[real] = LogIndex()
+            return index